@@ -1,24 +1,79 @@
 import streamlit as st
 import requests
-import json
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import re
 import time
-import base64
-import os
+import contextvars
+import dataclasses
+import functools
+import hashlib
+import html
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
-from typing import Dict, List, Any, Optional, Union, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Union, Tuple, Callable, Iterator
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # アプリケーション設定
 class Config:
     # デフォルト値
     DEFAULT_API_BASE_URL = "http://localhost:8080"
+    REQUEST_TIMEOUT = (3.05, 10)  # API呼び出しの（接続, 読み取り）タイムアウト（秒）
+    # 既定値から外れるエンドポイント別のタイムアウト（ポーリング系は短く、時間のかかる処理は長く）
+    ENDPOINT_TIMEOUTS = MappingProxyType({
+        "query": (1, 2),
+        "get_status": (1, 2),
+        "self_test": (3, 60),
+        "pd_calibration": (3, 60)
+    })
+    HTTP_POOL_CONNECTIONS = 4  # 接続プール数（接続先ホストは通常1つ）
+    HTTP_POOL_MAXSIZE = 20  # プールあたりの最大接続数（並行取得や複数ユーザーの同時操作に備える）
+    HTTP_MAX_RETRIES = 2  # 接続失敗時の再試行回数
+    HTTP_WORKERS = 8  # 並行取得に使うワーカースレッド数
+    HTTP_RETRY_STATUSES = (502, 503, 504)  # GETを再試行するゲートウェイ系ステータス
+    # GETだが機器の状態を変えるため、読み取り失敗・5xxでも再送しないエンドポイント
+    NON_IDEMPOTENT_GETS = frozenset({"logout", "reset_status", "self_test"})
+    CACHE_TTL_REALTIME = 5  # センサー・カセット状態など刻々と変わるデータのキャッシュ保持時間（秒）
+    CACHE_TTL_SHORT = 10  # 現金残高など取引のたびに変わるデータのキャッシュ保持時間（秒）
+    CACHE_TTL_NORMAL = 30  # ドア状態など時々変わるデータのキャッシュ保持時間（秒）
+    CACHE_TTL_LONG = 300  # 設定値やエラーメッセージなどほぼ変わらないデータのキャッシュ保持時間（秒）
+    POLL_INTERVAL_MIN = 0.05  # 取引照会の初回再試行間隔（秒）
+    POLL_INTERVAL_MAX = 2.0  # 取引照会の最大再試行間隔（秒）
+    # 金額として受け付ける入力（1以上の半角数字のみ、fullmatchで判定）
+    # （\dは全角・他の文字体系の数字にも一致するため使わない。0はAPIがエラー513で拒否する）
+    AMOUNT_PATTERN = re.compile(r"[1-9][0-9]{0,8}")
+    ACTION_DEBOUNCE = 0.5  # 同じ変更系操作の連続実行を無視する間隔（秒）
+    POLL_MAX_WAIT = 60  # 取引照会を繰り返す最大時間（秒）
+    PENDING_STATUSES = frozenset({"paying", "processing"})  # 照会を続ける処理中ステータス
+    # 取引ステータスごとの強調表示（該当しないステータスは成功扱い）
+    TRANSACTION_STATUS_CLASSES = MappingProxyType({
+        "Payment Error": "info-box-error",
+        "user cancelled": "info-box-error",
+        "no change": "info-box-error",
+        **{status: "info-box-warning" for status in PENDING_STATUSES}
+    })
+    DENOMINATIONS = (1, 5, 10, 50, 100, 500, 1000, 5000, 10000)  # 引き出しで選択できる金種（円）
+    CONNECTION_LABELS = ("🔴 未接続", "🟢 接続済み")  # モジュール接続状態の表示（False/Trueで参照）
+    # 正常とみなす状態のアイコン（小文字の状態で引き、該当しなければ🔴を表示）
+    DOOR_STATUS_ICONS = MappingProxyType({"closed": "🟢"})
+    CASSETTE_STATUS_ICONS = MappingProxyType({"true": "🟢"})
+    # 制御対象のドア（APIでのドア名, 表示名, ウィジェットのキー）
+    DOORS = (
+        ("Note Security Door", "紙幣セキュリティドア", "note_security_door"),
+        ("Note Drum Door", "紙幣ドラムドア", "note_drum_door"),
+        ("Note Cassette Door", "紙幣カセットドア", "note_cassette_door"),
+        ("Coin Security Door", "硬貨セキュリティドア", "coin_security_door")
+    )
     APP_TITLE = "Cash Point Pay マネジメントシステム"
     SESSION_COOKIE = "cash_point_pay_session"
+    TRANSACTION_QUERY_PARAM = "tx"  # 取引IDを保持するURLクエリパラメータ名
 
     # 各種エンドポイント
-    ENDPOINTS = {
+    ENDPOINTS = MappingProxyType({
         "login": "/api/login",
         "logout": "/api/logOut",
         "pay": "/api/pay",
@@ -54,10 +109,10 @@ class Config:
         "get_error_message": "/api/getErrorMessage",
         "setup_setting": "/api/setupSetting",
         "clear_hopper": "/api/clearHopper"
-    }
+    })
 
     # APIエラーコードとメッセージのマッピング
-    ERROR_CODES = {
+    ERROR_CODES = MappingProxyType({
         400: "アカウントまたはパスワードが間違っています",
         401: "まだログインしていません",
         500: "不明なエラーが発生しました",
@@ -76,256 +131,836 @@ class Config:
         513: "金額は0より大きくなければなりません",
         514: "硬貨モジュールの準備ができていません。後でもう一度お試しください",
         515: "他のAPIが現在使用中です"
-    }
+    })
+
+    # 機器エラーコードの分類と代表例（エラー診断ページの一覧表示用）
+    DEVICE_ERROR_CATEGORIES = MappingProxyType({
+        "001xxx": "紙幣モジュールエラー",
+        "002xxx": "硬貨モジュールエラー",
+        "003xxx": "システムエラー"
+    })
+    DEVICE_ERROR_EXAMPLES = MappingProxyType({
+        "001001": "紙幣が入口に長時間放置されています。もう一度入れてください(1)",
+        "001002": "紙幣が検出器に詰まっています。取り除いてください(2)",
+        "001032": "紙幣の排出中にエラーが発生しました(32)",
+        "002001": "硬貨が入口に詰まっています。取り除いてください(1)",
+        "002010": "硬貨チューブが満杯です(10)",
+        "003001": "システム通信エラー(1)",
+        "003010": "データベースエラー(10)"
+    })
+
+# 画面に表示する操作結果メッセージ（{}を含むものはformatで値を埋め込む）
+class Messages:
+    PAYMENT_AMOUNT_REQUIRED = "支払い金額を入力してください。"
+    PAY_ITEMS_REQUIRED = "少なくとも1つの有効な商品を入力してください。"
+    POS_REFERENCE_REQUIRED = "POS参照番号を入力してください。"
+    PAYMENT_STARTED = "支払い処理が開始されました。取引ID: {uuid}"
+    PAYMENT_START_FAILED = "支払い処理の開始に失敗しました。"
+    POS_PAY_STARTED = "POS支払い処理が開始されました。取引ID: {uuid}"
+    POS_PAY_START_FAILED = "POS支払い処理の開始に失敗しました。"
+    POS_PAYMENT_STARTED = "POS金額支払い処理が開始されました。取引ID: {uuid}"
+    POS_PAYMENT_START_FAILED = "POS金額支払い処理の開始に失敗しました。"
+    TRANSACTION_CANCELLED = "取引がキャンセルされました。"
+    TRANSACTION_CANCEL_FAILED = "取引のキャンセルに失敗しました。"
+    TRANSACTION_STOPPED = "取引が停止されました。"
+    TRANSACTION_STOP_FAILED = "取引の停止に失敗しました。"
+    TRANSACTION_CONTINUED = "取引が再開されました。"
+    TRANSACTION_CONTINUE_FAILED = "取引の再開に失敗しました。"
+    TRANSACTION_ID_REQUIRED = "取引IDを入力してください。"
+    TRANSACTION_STATUS_FETCH_FAILED = "取引ステータスの取得に失敗しました。"
+    DRUM_DETAIL_FETCH_FAILED = "ドラム詳細情報の取得に失敗しました。"
+    CASH_INFO_FETCH_FAILED = "現金情報の取得に失敗しました。"
+    REFILL_STARTED = "補充プロセスが開始されました。ID: {uuid}"
+    REFILL_START_FAILED = "補充プロセスの開始に失敗しました。"
+    REFILL_ENDED = "補充プロセスが完了しました。"
+    REFILL_END_FAILED = "補充プロセスの終了に失敗しました。"
+    REFUND_STARTED = "払い戻しプロセスが開始されました。ID: {uuid}"
+    REFUND_START_FAILED = "払い戻しプロセスの開始に失敗しました。"
+    REFUND_AMOUNT_REQUIRED = "払い戻し金額を入力してください。"
+    AMOUNT_INVALID = "金額は1以上の半角数字で入力してください。"
+    DRUM_TO_CASSETTE_DONE = "ドラム {drum_id} からカセットに {drum_pcs} 枚の紙幣が移動されました。"
+    DRUM_TO_CASSETTE_FAILED = "紙幣の移動に失敗しました。"
+    CASSETTE_RESET_DONE = "カセットカウントがリセットされました。"
+    CASSETTE_RESET_FAILED = "カセットリセットに失敗しました。"
+    COIN_BOX_RESET_DONE = "コインボックスカウントがリセットされました。"
+    COIN_BOX_RESET_FAILED = "コインボックスリセットに失敗しました。"
+    ACTION_IN_PROGRESS = "同じ操作を実行中、または直前に実行したため、今回の操作は送信しませんでした。"
+    WITHDRAW_STARTED = "引き出しプロセスが開始されました。ID: {uuid}"
+    WITHDRAW_START_FAILED = "引き出しプロセスの開始に失敗しました。"
+    WITHDRAW_ITEMS_REQUIRED = "少なくとも1つのアイテムの枚数を1以上に設定してください。"
+    STATUS_RESET_DONE = "システムステータスがリセットされました。"
+    STATUS_RESET_FAILED = "システムステータスのリセットに失敗しました。"
+    SELF_TEST_DONE = "自己診断テストが正常に実行されました。"
+    SELF_TEST_FAILED = "自己診断テストの実行に失敗しました。"
+    CALIBRATION_DONE = "紙幣モジュールのキャリブレーションが正常に実行されました。"
+    CALIBRATION_FAILED = "キャリブレーションの実行に失敗しました。"
+    DEVICE_SETTING_SAVED = "デバイス設定が保存されました。"
+    DEVICE_SETTING_SAVE_FAILED = "デバイス設定の保存に失敗しました。"
+    DEVICE_SETTING_REQUIRED = "デバイスIDとURLを入力してください。"
+    USER_SETTING_SAVED = "ユーザー設定が保存されました。"
+    USER_SETTING_SAVE_FAILED = "ユーザー設定の保存に失敗しました。"
+    HOPPER_CLEAR_DONE = "ホッパークリアが正常に実行されました。"
+    HOPPER_CLEAR_FAILED = "ホッパークリアの実行に失敗しました。"
+    BANKNOTE_SETTING_SAVED = "紙幣設定が保存されました。"
+    BANKNOTE_SETTING_SAVE_FAILED = "紙幣設定の保存に失敗しました。"
+    BANKNOTE_SETTING_NOT_FOUND = "紙幣設定データが見つかりませんでした。"
+    BANKNOTE_SETTING_FETCH_FAILED = "紙幣設定データの取得に失敗しました。"
+    COIN_SETTING_SAVED = "硬貨設定が保存されました。"
+    COIN_SETTING_SAVE_FAILED = "硬貨設定の保存に失敗しました。"
+    COIN_SETTING_NOT_FOUND = "硬貨設定データが見つかりませんでした。"
+    COIN_SETTING_FETCH_FAILED = "硬貨設定データの取得に失敗しました。"
+    SETTINGS_UNCHANGED = "設定に変更はありません。"
+    DOOR_CONTROL_DONE = "ドア制御が正常に実行されました。"
+    DOOR_CONTROL_FAILED = "ドア制御の実行に失敗しました。"
+    MACHINE_INFO_FETCH_FAILED = "機器情報の取得に失敗しました。"
+    NOTE_SENSOR_NOT_FOUND = "紙幣センサーデータが見つかりませんでした。"
+    CASSETTE_STATUS_FETCH_FAILED = "カセットステータスの取得に失敗しました。"
+    SENSOR_STATUS_FETCH_FAILED = "センサー状態の取得に失敗しました。"
+    ERROR_MESSAGE_FETCH_FAILED = "エラーメッセージの取得に失敗しました。"
+    ERROR_CODE_REQUIRED = "エラーコードを入力してください。"
+    STATUS_FETCH_FAILED = "システムステータスの取得に失敗しました。"
+    STALE_DATA = "最新のデータを取得できなかったため、データは最終取得時点（{fetched_at}）のものです。"
+    HISTORY_ADDED = "トランザクションが履歴に追加されました。"
+    HISTORY_FETCH_FAILED = "トランザクション情報の取得に失敗しました。"
+    HISTORY_DUPLICATE = "このトランザクションはすでに履歴に存在します。"
+    HISTORY_ID_REQUIRED = "トランザクションIDを入力してください。"
+    HISTORY_PAY_ITEMS_EMPTY = "支払いアイテムデータがありません。"
+    HISTORY_DETAIL_EMPTY = "取引詳細データがありません。"
+    HISTORY_CLEARED = "トランザクション履歴がクリアされました。"
+    HISTORY_EMPTY = "トランザクション履歴がありません。トランザクションIDを追加してください。"
+
+    @staticmethod
+    def with_code(message: str, error_code: Optional[Any]) -> str:
+        """エラーコードがあればメッセージの末尾に添える"""
+        return f"{message}（エラーコード: {error_code}）" if error_code is not None else message
 
 # API接続を管理するクラス
 class CashPointPayAPI:
-    def __init__(self, base_url: str):
+    # 属性は固定なのでインスタンス辞書を持たせない
+    __slots__ = ("base_url", "timeout", "session", "urls", "timeouts", "_etags", "_body_hashes", "_last_payload")
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: Union[float, Tuple[float, float]] = Config.REQUEST_TIMEOUT,
+        adapters: Optional[Dict[str, HTTPAdapter]] = None
+    ):
         self.base_url = base_url
+        self.timeout = timeout
+        # クッキー（ログイン状態）はインスタンスごとに持ち、接続プールは渡されたアダプタを使い回す
         self.session = requests.Session()
+        for prefix, adapter in (adapters or self.build_adapters(base_url)).items():
+            self.session.mount(prefix, adapter)
+        self.session.headers.update({"Accept": "application/json", "Connection": "keep-alive"})
+        # エンドポイントの完全なURLは固定なので初期化時に一度だけ生成
+        self.urls = {name: base_url + path for name, path in Config.ENDPOINTS.items()}
+        self.timeouts = {name: Config.ENDPOINT_TIMEOUTS.get(name, timeout) for name in Config.ENDPOINTS}
+        # 条件付きGET用に、エンドポイントごとのETag・本文ハッシュと前回の解析結果を保持
+        self._etags: Dict[str, str] = {}
+        self._body_hashes: Dict[str, str] = {}
+        self._last_payload: Dict[str, Dict] = {}
 
-    def make_url(self, endpoint: str) -> str:
-        """APIエンドポイントの完全なURLを生成"""
-        return f"{self.base_url}{endpoint}"
+    @staticmethod
+    def build_adapters(base_url: str) -> Dict[str, HTTPAdapter]:
+        """接続プールを持つアダプタを生成（マウント先のURLの前方一致→アダプタ）"""
+        adapter = HTTPAdapter(
+            pool_connections=Config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+            # 送信前の接続失敗は全メソッドで再試行するが、読み取り失敗・5xxの再試行はGETに限る
+            # （支払いなどのPOSTを二重に送らないため）
+            max_retries=Retry(
+                total=Config.HTTP_MAX_RETRIES,
+                connect=Config.HTTP_MAX_RETRIES,
+                read=1,
+                backoff_factor=0.3,
+                status_forcelist=Config.HTTP_RETRY_STATUSES,
+                allowed_methods=frozenset({"GET"}),
+                raise_on_status=False
+            )
+        )
+        adapters = {"http://": adapter, "https://": adapter}
+        # 自己診断・ステータスリセットなどは二重に実行されないよう、送信前の接続失敗だけを再試行する
+        # （requestsはURLの前方一致が最も長いアダプタを使う）
+        no_resend_adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=Config.HTTP_POOL_CONNECTIONS,
+            max_retries=Retry(
+                total=Config.HTTP_MAX_RETRIES,
+                connect=Config.HTTP_MAX_RETRIES,
+                read=0,
+                status=0,
+                backoff_factor=0.3,
+                raise_on_status=False
+            )
+        )
+        for name in Config.NON_IDEMPOTENT_GETS:
+            adapters[base_url + Config.ENDPOINTS[name]] = no_resend_adapter
+        return adapters
 
     def handle_response(self, response: requests.Response) -> Dict:
         """APIレスポンスの処理とエラーハンドリング"""
+        # 本文のない応答（304や空ボディ）はデコードせずステータスコードだけで判定
+        if response.status_code == 304 or not response.content:
+            if not response.ok:
+                st.error(f"APIエラー: HTTP {response.status_code}")
+            return {"isSuccess": response.ok}
+
+        # HTMLのエラーページなどJSON以外の応答はデコードを試みない
+        content_type = response.headers.get("Content-Type", "")
+        if content_type and "json" not in content_type:
+            st.error(f"応答の解析に失敗しました: HTTP {response.status_code} ({content_type})")
+            return {"isSuccess": False, "errorMsg": "応答の解析に失敗しました"}
+
         try:
-            data = response.json()
+            # bytesを直接デコードしてstrへの変換と標準jsonモジュールを経由しない
+            data = orjson.loads(response.content)
             if not data.get("isSuccess", False):
-                st.error(f"APIエラー: {data.get('errorMsg', '不明なエラー')}")
+                # エラーコードが既知なら手元の対応表で表示し、メッセージ取得の往復を省く
+                error_code = data.get("errorCode")
+                if isinstance(error_code, str) and error_code.isdigit():
+                    error_code = int(error_code)
+                if error_code in Config.ERROR_CODES:
+                    data["errorMsg"] = Config.ERROR_CODES[error_code]
+                st.error(f"APIエラー: {data.get('errorMsg') or '不明なエラー'}")
             return data
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             st.error(f"応答の解析に失敗しました: {response.text}")
             return {"isSuccess": False, "errorMsg": "応答の解析に失敗しました"}
 
+    def _request(self, method: str, name: str, **kwargs) -> Optional[requests.Response]:
+        """エンドポイント別のタイムアウトで送信（通信エラー時はエラーを表示してNoneを返す）"""
+        guard, lock = get_prefetch_guard()
+        try:
+            response = self.session.request(method, self.urls[name], timeout=self.timeouts[name], **kwargs)
+        except requests.RequestException as e:
+            # 接続先が応答しない間は先読みを止める
+            with lock:
+                guard["unreachable"].add(self.base_url)
+            st.error(f"API通信エラー: {e}")
+            return None
+        with lock:
+            guard["unreachable"].discard(self.base_url)
+        return response
+
+    def _get(self, name: str) -> Dict:
+        """GETリクエストを送信してレスポンスを処理"""
+        response = self._request("GET", name)
+        if response is None:
+            return {"isSuccess": False, "errorMsg": "API通信エラー"}
+        return self.handle_response(response)
+
+    def _conditional_get(self, name: str) -> Dict:
+        """If-None-Matchを付けてGETし、未変更なら前回の解析結果を再利用する"""
+        etag = self._etags.get(name)
+        headers = {"If-None-Match": etag} if etag else None
+        response = self._request("GET", name, headers=headers)
+        if response is None:
+            return {"isSuccess": False, "errorMsg": "API通信エラー"}
+        if response.status_code == 304 and name in self._last_payload:
+            return self._last_payload[name]
+
+        # ETagを返さないサーバー向けに、本文のハッシュが同じなら解析を省く
+        body_hash = hashlib.sha1(response.content).hexdigest()
+        if self._body_hashes.get(name) == body_hash and name in self._last_payload:
+            return self._last_payload[name]
+
+        data = self.handle_response(response)
+        if data.get("isSuccess", False):
+            if "ETag" in response.headers:
+                self._etags[name] = response.headers["ETag"]
+            self._body_hashes[name] = body_hash
+            self._last_payload[name] = data
+        return data
+
+    def _post(self, name: str, payload: Any = None) -> Dict:
+        """POSTリクエストを送信してレスポンスを処理（payloadがNoneの場合はボディなし）"""
+        if payload is None:
+            response = self._request("POST", name)
+        else:
+            response = self._request(
+                "POST",
+                name,
+                data=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"}
+            )
+        if response is None:
+            return {"isSuccess": False, "errorMsg": "API通信エラー"}
+        return self.handle_response(response)
+
     def login(self, account: str, password: str) -> Dict:
         """システムにログイン"""
-        url = self.make_url(Config.ENDPOINTS["login"])
-        payload = {"account": account, "password": password}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("login", {"account": account, "password": password})
 
     def logout(self) -> Dict:
         """システムからログアウト"""
-        url = self.make_url(Config.ENDPOINTS["logout"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        response = self._get("logout")
+        # このクライアント（ブラウザセッション）のセッションクッキーを破棄する
+        self.session.cookies.clear()
+        return response
 
     def pay(self, items: List[Dict[str, Any]]) -> Dict:
         """支払い処理を開始"""
-        url = self.make_url(Config.ENDPOINTS["pay"])
-        payload = {"items": items}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("pay", {"items": items})
 
     def payment(self, amount: str) -> Dict:
         """指定金額の支払い処理を開始"""
-        url = self.make_url(Config.ENDPOINTS["payment"])
-        payload = {"amount": amount}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("payment", {"amount": amount})
 
     def pos_pay(self, items: List[Dict[str, Any]], pos_reference_number: str) -> Dict:
         """POS参照番号付きの支払い処理を開始"""
-        url = self.make_url(Config.ENDPOINTS["pos_pay"])
-        payload = {"items": items, "POS_reference_number": pos_reference_number}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("pos_pay", {"items": items, "POS_reference_number": pos_reference_number})
 
     def pos_payment(self, amount: str, pos_reference_number: str) -> Dict:
         """POS参照番号付きの指定金額支払い処理を開始"""
-        url = self.make_url(Config.ENDPOINTS["pos_payment"])
-        payload = {"amount": amount, "POS_reference_number": pos_reference_number}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("pos_payment", {"amount": amount, "POS_reference_number": pos_reference_number})
 
     def query(self, uuid: str) -> Dict:
         """取引状態を照会"""
-        url = self.make_url(Config.ENDPOINTS["query"])
-        payload = {"uuid": uuid}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("query", {"uuid": uuid})
+
+    def poll_query(self, uuid: str, max_wait: float = Config.POLL_MAX_WAIT) -> Iterator[Dict]:
+        """処理中の間、間隔を倍々に広げながら取引状態を照会し続ける"""
+        delay = Config.POLL_INTERVAL_MIN
+        deadline = time.monotonic() + max_wait
+        while True:
+            response = self.query(uuid)
+            yield response
+            data = response.get("data") if response.get("isSuccess", False) else None
+            status = data.get("info", {}).get("status") if isinstance(data, dict) else None
+            if status not in Config.PENDING_STATUSES or time.monotonic() + delay > deadline:
+                return
+            time.sleep(delay)
+            delay = min(delay * 2, Config.POLL_INTERVAL_MAX)
 
     def get_machine_info(self) -> Dict:
         """機器情報を取得"""
-        url = self.make_url(Config.ENDPOINTS["machine_info"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._conditional_get("machine_info")
 
     def door_control(self, door_settings: Dict[str, str], timeout: int = 10) -> Dict:
         """ドアロックを制御"""
-        url = self.make_url(Config.ENDPOINTS["door_control"])
-        payload = {**door_settings, "Open Timeout": timeout}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("door_control", {**door_settings, "Open Timeout": timeout})
 
     def get_cash_info(self) -> Dict:
         """現金情報を取得"""
-        url = self.make_url(Config.ENDPOINTS["cash_info"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._get("cash_info")
 
     def get_cash_detail_info(self, name: str) -> Dict:
         """指定したドラムの詳細情報を取得"""
-        url = self.make_url(Config.ENDPOINTS["cash_detail_info"])
-        payload = {"name": name}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("cash_detail_info", {"name": name})
 
     def refill(self) -> Dict:
         """現金モジュールの補充プロセスを開始"""
-        url = self.make_url(Config.ENDPOINTS["refill"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("refill")
 
     def refill_end(self) -> Dict:
         """現金モジュールの補充プロセスを終了"""
-        url = self.make_url(Config.ENDPOINTS["refill_end"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("refill_end")
 
     def refund(self, amount: str) -> Dict:
         """指定金額を払い戻し"""
-        url = self.make_url(Config.ENDPOINTS["refund"])
-        payload = {"amount": amount}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("refund", {"amount": amount})
 
     def withdraw(self, withdraw_items: List[Dict[str, Any]]) -> Dict:
         """指定した紙幣・硬貨を引き出し"""
-        url = self.make_url(Config.ENDPOINTS["withdraw"])
-        payload = {"withdraw": withdraw_items}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("withdraw", {"withdraw": withdraw_items})
 
     def cancel(self) -> Dict:
         """進行中の支払いをキャンセル"""
-        url = self.make_url(Config.ENDPOINTS["cancel"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("cancel")
 
     def payment_stop(self) -> Dict:
         """現在のトランザクションを完了"""
-        url = self.make_url(Config.ENDPOINTS["payment_stop"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("payment_stop")
 
     def payment_continue(self) -> Dict:
         """一時停止したトランザクションを再開"""
-        url = self.make_url(Config.ENDPOINTS["payment_continue"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("payment_continue")
 
     def get_sensor_status(self) -> Dict:
         """モジュールのセンサー状態を取得"""
-        url = self.make_url(Config.ENDPOINTS["sensor_status"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._get("sensor_status")
 
     def get_cassette_status(self) -> Dict:
         """カセットの状態を取得"""
-        url = self.make_url(Config.ENDPOINTS["cassette_status"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._conditional_get("cassette_status")
 
     def pd_calibration(self) -> Dict:
         """紙幣モジュールの位置検出器キャリブレーション"""
-        url = self.make_url(Config.ENDPOINTS["pd_calibration"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("pd_calibration")
 
     def reset_cassette(self) -> Dict:
         """カセットのカウントをリセット"""
-        url = self.make_url(Config.ENDPOINTS["reset_cassette"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("reset_cassette")
 
     def reset_coin_box(self) -> Dict:
         """コインボックスのカウントをリセット"""
-        url = self.make_url(Config.ENDPOINTS["reset_coin_box"])
-        response = self.session.post(url)
-        return self.handle_response(response)
+        return self._post("reset_coin_box")
 
     def drum_to_cassette(self, drum_id: int, pcs: int) -> Dict:
         """ドラムからカセットに紙幣を移動"""
-        url = self.make_url(Config.ENDPOINTS["drum_to_cassette"])
-        payload = {"drumId": drum_id, "pcs": pcs}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("drum_to_cassette", {"drumId": drum_id, "pcs": pcs})
 
     def get_status(self) -> Dict:
         """システムの現在の状態を取得"""
-        url = self.make_url(Config.ENDPOINTS["get_status"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._get("get_status")
 
     def reset_status(self) -> Dict:
         """機器のステータスをスタンバイに戻す"""
-        url = self.make_url(Config.ENDPOINTS["reset_status"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._get("reset_status")
 
     def self_test(self) -> Dict:
         """紙幣・硬貨モジュールの自己診断テスト"""
-        url = self.make_url(Config.ENDPOINTS["self_test"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._get("self_test")
 
     def get_banknote_denomination_setup(self) -> Dict:
         """紙幣モジュールの額面設定情報を取得"""
-        url = self.make_url(Config.ENDPOINTS["banknote_denomination_setup_get"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._conditional_get("banknote_denomination_setup_get")
 
     def set_banknote_denomination_setup(self, settings: List[Dict[str, Any]]) -> Dict:
         """紙幣モジュールの額面設定を構成"""
-        url = self.make_url(Config.ENDPOINTS["banknote_denomination_setup_post"])
-        response = self.session.post(url, json=settings)
-        return self.handle_response(response)
+        return self._post("banknote_denomination_setup_post", settings)
 
     def get_coin_tube_setup(self) -> Dict:
         """硬貨モジュールの設定情報を取得"""
-        url = self.make_url(Config.ENDPOINTS["coin_tube_setup_get"])
-        response = self.session.get(url)
-        return self.handle_response(response)
+        return self._conditional_get("coin_tube_setup_get")
 
     def set_coin_tube_setup(self, settings: List[Dict[str, Any]]) -> Dict:
         """硬貨モジュールの設定を構成"""
-        url = self.make_url(Config.ENDPOINTS["coin_tube_setup_post"])
-        response = self.session.post(url, json=settings)
-        return self.handle_response(response)
+        return self._post("coin_tube_setup_post", settings)
 
     def set_device_setting(self, device_id: str, url: str) -> Dict:
         """デバイス設定を構成"""
-        url_endpoint = self.make_url(Config.ENDPOINTS["set_device_setting"])
-        payload = {"deviceId": device_id, "url": url}
-        response = self.session.post(url_endpoint, json=payload)
-        return self.handle_response(response)
+        return self._post("set_device_setting", {"deviceId": device_id, "url": url})
 
     def get_error_message(self, error_code: str) -> Dict:
         """エラーコードに対応するエラーメッセージを取得"""
-        url = self.make_url(Config.ENDPOINTS["get_error_message"])
-        payload = {"errorCode": error_code}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("get_error_message", {"errorCode": error_code})
 
     def setup_setting(self, name: str, value: int) -> Dict:
         """ユーザー設定を構成"""
-        url = self.make_url(Config.ENDPOINTS["setup_setting"])
-        payload = {"name": name, "value": value}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("setup_setting", {"name": name, "value": value})
 
     def clear_hopper(self, hopper_id: int) -> Dict:
         """ホッパーをクリア"""
-        url = self.make_url(Config.ENDPOINTS["clear_hopper"])
-        payload = {"hopperId": hopper_id}
-        response = self.session.post(url, json=payload)
-        return self.handle_response(response)
+        return self._post("clear_hopper", {"hopperId": hopper_id})
+
+# APIレスポンスの分解
+def unwrap(response: Optional[Dict]) -> Tuple[bool, Any, Optional[Any]]:
+    """レスポンスを（成功したか, data, errorCode）に分解する"""
+    if not response:
+        return False, None, None
+    return response.get("isSuccess", False), response.get("data"), response.get("errorCode")
+
+# 接続プールの共有
+@st.cache_resource(show_spinner=False)
+def get_http_adapters(base_url: str) -> Dict[str, HTTPAdapter]:
+    """base_urlごとにアダプタ（接続プール）をプロセス全体で共有（再実行・ブラウザセッションをまたいで接続を維持）"""
+    return CashPointPayAPI.build_adapters(base_url)
+
+# APIクライアントの管理
+def get_api(base_url: str) -> CashPointPayAPI:
+    """ブラウザセッションごと・base_urlごとのAPIクライアントを返す
+    （ログイン状態のクッキーを他のセッションと共有しないよう、クライアントはsession_stateに持つ）"""
+    clients = st.session_state.setdefault("api_clients", {})
+    if base_url not in clients:
+        clients[base_url] = CashPointPayAPI(base_url, adapters=get_http_adapters(base_url))
+    return clients[base_url]
+
+# 参照系APIのキャッシュ
+class UncachedResponse(Exception):
+    """キャッシュに残さない（失敗した）レスポンスをキャッシュ関数の外へ運ぶ例外"""
+    def __init__(self, response: Dict):
+        super().__init__(response.get("errorMsg"))
+        self.response = response
+
+def cached_get(ttl: Optional[int] = None, max_entries: Optional[int] = None):
+    """参照系API呼び出しをst.cache_dataでキャッシュするデコレータ（失敗レスポンスは保持しない）"""
+    def decorator(func: Callable[..., Dict]) -> Callable[..., Dict]:
+        # 失敗時は例外で抜けてst.cache_dataに保存させない（他の引数のキャッシュはそのまま残る）
+        # wrapsで元の関数名・ソースを引き継ぎ、キャッシュのキーが関数ごとに分かれるようにする
+        @functools.wraps(func)
+        def fetch(*args) -> Dict:
+            response = func(*args)
+            if not response.get("isSuccess", False):
+                raise UncachedResponse(response)
+            return response
+
+        cached = st.cache_data(ttl=ttl, max_entries=max_entries, show_spinner=False)(fetch)
+
+        @functools.wraps(func)
+        def wrapper(*args) -> Dict:
+            try:
+                return cached(*args)
+            except UncachedResponse as e:
+                return e.response
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
+# 最後に取得できたレスポンスの保持（バックエンドの一時的な停止時に表示を保つ）
+@st.cache_resource(show_spinner=False)
+def get_last_good() -> Tuple[Dict[Tuple, Tuple[Any, datetime]], threading.Lock]:
+    """スクリプトの再実行で消えないよう、最終取得データとロックをプロセス全体で共有"""
+    return {}, threading.Lock()
+
+def stale_while_error(func: Callable[..., Dict]) -> Callable[..., Dict]:
+    """取得に失敗した場合、最後に成功したデータをstale付きの成功レスポンスとして返すデコレータ"""
+    @functools.wraps(func)
+    def wrapper(*args) -> Dict:
+        key = (func.__name__, *args)
+        last_good, lock = get_last_good()
+        response = func(*args)
+        if response.get("isSuccess", False):
+            with lock:
+                last_good[key] = (response.get("data"), datetime.now())
+            return response
+        with lock:
+            last = last_good.get(key)
+        if last is None:
+            return response
+        data, fetched_at = last
+        return {"isSuccess": True, "data": data, "stale": True, "fetchedAt": fetched_at}
+
+    wrapper.clear = func.clear
+    return wrapper
+
+@stale_while_error
+@cached_get(ttl=Config.CACHE_TTL_SHORT)
+def cached_status(base_url: str) -> Dict:
+    """システムステータスを取得（キャッシュ付き）"""
+    return get_api(base_url).get_status()
+
+@stale_while_error
+@cached_get(ttl=Config.CACHE_TTL_REALTIME)
+def cached_cash_info(base_url: str) -> Dict:
+    """現金情報を取得（キャッシュ付き）"""
+    return get_api(base_url).get_cash_info()
+
+@cached_get(ttl=Config.CACHE_TTL_REALTIME)
+def cached_sensor_status(base_url: str) -> Dict:
+    """センサーの状態を取得（キャッシュ付き）"""
+    return get_api(base_url).get_sensor_status()
+
+@cached_get(ttl=Config.CACHE_TTL_REALTIME)
+def cached_cassette_status(base_url: str) -> Dict:
+    """カセットの状態を取得（キャッシュ付き）"""
+    return get_api(base_url).get_cassette_status()
+
+@stale_while_error
+@cached_get(ttl=Config.CACHE_TTL_NORMAL)
+def cached_machine_info(base_url: str) -> Dict:
+    """機器情報を取得（キャッシュ付き）"""
+    return get_api(base_url).get_machine_info()
+
+@cached_get(ttl=Config.CACHE_TTL_LONG)
+def cached_banknote_setup(base_url: str) -> Dict:
+    """紙幣モジュールの額面設定情報を取得（キャッシュ付き）"""
+    return get_api(base_url).get_banknote_denomination_setup()
+
+@cached_get(ttl=Config.CACHE_TTL_LONG)
+def cached_coin_setup(base_url: str) -> Dict:
+    """硬貨モジュールの設定情報を取得（キャッシュ付き）"""
+    return get_api(base_url).get_coin_tube_setup()
+
+@cached_get(ttl=Config.CACHE_TTL_SHORT, max_entries=256)
+def cached_query(base_url: str, uuid: str) -> Dict:
+    """取引情報を照会（キャッシュ付き。処理中の取引の追跡では照会し直すよう保持時間は短くする）"""
+    return get_api(base_url).query(uuid)
+
+@cached_get(ttl=Config.CACHE_TTL_LONG, max_entries=256)
+def cached_error_message(base_url: str, error_code: str) -> Dict:
+    """エラーコードに対応するエラーメッセージを取得（キャッシュ付き）"""
+    return get_api(base_url).get_error_message(error_code)
+
+# 表示用データの組み立て（取得データが変わらない間は再実行ごとに作り直さない）
+def downcast_integers(df):
+    """整数列を値が収まる最小の型に変換（ブラウザへ送るArrowデータを小さくする）"""
+    import pandas as pd
+    for column in df.select_dtypes("integer").columns:
+        df[column] = pd.to_numeric(df[column], downcast="integer")
+    return df
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_cash_table(items: List[Dict]):
+    """現金情報・取引明細の一覧をDataFrameに変換"""
+    import pandas as pd
+    return downcast_integers(pd.DataFrame(items))
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_denomination_pie(items: List[Dict], title: str, palette: str):
+    """金種ごとの金額分布の円グラフを作成（paletteはplotlyの連続カラースケール名）"""
+    import plotly.express as px
+    return px.pie(
+        items,
+        values="amount",
+        names="denomination",
+        title=title,
+        color_discrete_sequence=getattr(px.colors.sequential, palette)
+    )
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_coin_stock_bar(coins: List[Dict]):
+    """硬貨の場所・金種ごとの在庫枚数の棒グラフを作成"""
+    import plotly.express as px
+    return px.bar(
+        coins,
+        x="denomination",
+        y="pcs",
+        color="name",
+        title="硬貨在庫状況",
+        labels={"denomination": "金種", "pcs": "枚数", "name": "場所"}
+    )
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_transaction_detail_bar(detail_items: List[Dict]):
+    """取引の金種・入出金状態ごとの枚数の棒グラフを作成"""
+    import plotly.express as px
+    return px.bar(
+        detail_items,
+        x="denomination",
+        y="pcs",
+        color="status",
+        title="取引詳細グラフ",
+        labels={"denomination": "金種", "pcs": "枚数", "status": "状態"}
+    )
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_sensor_heatmap(pivot_df):
+    """センサー名×オン/オフ状態ごとの値のヒートマップを作成（DataFrameの内容でキャッシュ）"""
+    import plotly.express as px
+    return px.imshow(
+        pivot_df,
+        labels=dict(x="状態", y="センサー名", color="値"),
+        title="センサー値ヒートマップ"
+    )
+
+@st.cache_data(show_spinner=False)
+def build_error_category_table():
+    """エラーコード分類の一覧をDataFrameに変換（固定値のため初回のみ作成）"""
+    import pandas as pd
+    return pd.DataFrame(
+        list(Config.DEVICE_ERROR_CATEGORIES.items()), columns=["コード範囲", "説明"]
+    )
+
+@st.cache_data(show_spinner=False)
+def build_error_example_table():
+    """代表的なエラーコード例の一覧をDataFrameに変換（固定値のため初回のみ作成）"""
+    import pandas as pd
+    return pd.DataFrame(
+        list(Config.DEVICE_ERROR_EXAMPLES.items()), columns=["エラーコード", "説明"]
+    )
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_history_table(rows: Tuple[Tuple, ...]):
+    """追跡中の取引の一覧をDataFrameに変換（行は タイムスタンプ, UUID, ステータス, 金額, お釣り の順）"""
+    import pandas as pd
+    return downcast_integers(pd.DataFrame(rows, columns=["タイムスタンプ", "UUID", "ステータス", "金額", "お釣り"]))
+
+# 先読みの抑制（バックエンドの停止中に、失敗するだけの先読みでスレッドプールを埋めないため）
+@st.cache_resource(show_spinner=False)
+def get_prefetch_guard() -> Tuple[Dict[str, set], threading.Lock]:
+    """直前の通信が失敗した接続先（unreachable）と先読み中の接続先（in_flight）の集合とロックをプロセス全体で共有"""
+    return {"unreachable": set(), "in_flight": set()}, threading.Lock()
+
+# 並行取得用スレッドプールの共有
+@st.cache_resource(show_spinner=False)
+def get_executor() -> ThreadPoolExecutor:
+    """再実行ごとにスレッドを作り直さないよう、プロセス全体で1つのスレッドプールを共有
+    （APIクライアントのセッションは接続プールを持つため、ワーカー間で共有して呼び出せる）"""
+    return ThreadPoolExecutor(max_workers=Config.HTTP_WORKERS, thread_name_prefix="api")
+
+# 独立したAPI呼び出しの並行実行
+def fetch_concurrently(calls: Dict[str, Callable[[], Dict]]) -> Dict[str, Dict]:
+    """互いに依存しないAPI呼び出しを並行実行し、キーごとのレスポンスを返す"""
+    ctx = get_script_run_ctx()
+
+    def run(call: Callable[[], Dict]) -> Dict:
+        # ワーカースレッドからもst.errorを表示できるようにスクリプトコンテキストを引き継ぐ
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return call()
+
+    # 描画先のコンテナ（タブなど）はcontextvarsで管理されるため、呼び出し元の状態を複製して渡し、
+    # ワーカーが出したエラーがページの末尾ではなく呼び出し元の位置に表示されるようにする
+    executor = get_executor()
+    futures = {
+        key: executor.submit(contextvars.copy_context().run, run, call)
+        for key, call in calls.items()
+    }
+    return {key: future.result() for key, future in futures.items()}
+
+# データの先読み
+def prefetch(base_url: str, *calls: Callable[[], Any]) -> None:
+    """描画を待たせずにバックグラウンドで並行に呼び出し、結果をキャッシュに載せておく
+    （取得中に同じキャッシュを読んだ呼び出しは、重複して送信せずその結果を待つ）"""
+    # 直前の通信が失敗した接続先や、別のセッションの先読みがまだ終わっていない接続先には送らない
+    guard, lock = get_prefetch_guard()
+    with lock:
+        if base_url in guard["unreachable"] or base_url in guard["in_flight"]:
+            return
+        guard["in_flight"].add(base_url)
+    remaining = [len(calls)]
+
+    # st.cache_dataへの書き込みにはスクリプトコンテキストが要るが、ページの描画とは切り離す
+    # （送信先を捨てる別のコンテキストにして、取得失敗時のst.errorなどを画面に出さず、
+    #   描画位置のカーソルやキャッシュ関数の実行中フラグもページ側と共有しない）
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        ctx = dataclasses.replace(ctx, _enqueue=lambda msg: None, cursors={})
+
+    def run(call: Callable[[], Any]) -> None:
+        add_script_run_ctx(threading.current_thread(), ctx)
+        try:
+            call()
+        finally:
+            with lock:
+                remaining[0] -= 1
+                if not remaining[0]:
+                    guard["in_flight"].discard(base_url)
+
+    # 並行取得と同じスレッドプールに載せ、先読みのたびにスレッドを作らない
+    executor = get_executor()
+    for call in calls:
+        executor.submit(run, call)
+
+# カスタムCSS（毎回の再実行で組み立て直さないようモジュール定数として保持し、
+# 送信量を減らすため読み込み時に一度だけ空白を詰めておく）
+CUSTOM_CSS = " ".join("""
+<style>
+.main-header {
+    font-size: 2.5rem;
+    color: #1E3A8A;
+    text-align: center;
+    margin-bottom: 2rem;
+    padding-bottom: 1rem;
+    border-bottom: 2px solid #E5E7EB;
+}
+.info-box {
+    padding: 1rem;
+    border-radius: 0.5rem;
+    margin-bottom: 1rem;
+}
+.info-box-success {
+    background-color: #D1FAE5;
+    border: 1px solid #10B981;
+}
+.info-box-warning {
+    background-color: #FEF3C7;
+    border: 1px solid #F59E0B;
+}
+.info-box-error {
+    background-color: #FEE2E2;
+    border: 1px solid #EF4444;
+}
+.sidebar-header {
+    font-size: 1.5rem;
+    font-weight: 600;
+    margin-bottom: 1rem;
+}
+.metrics-container {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 1rem;
+}
+.metric-card {
+    flex: 1;
+    min-width: 200px;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    background-color: #F3F4F6;
+    text-align: center;
+}
+.metric-value {
+    font-size: 2rem;
+    font-weight: 700;
+    color: #1E3A8A;
+}
+.metric-label {
+    font-size: 0.875rem;
+    color: #6B7280;
+}
+.btn-primary {
+    background-color: #1E3A8A;
+    color: white;
+    padding: 0.5rem 1rem;
+    border-radius: 0.25rem;
+    font-weight: 600;
+    border: none;
+    cursor: pointer;
+}
+.btn-secondary {
+    background-color: #6B7280;
+    color: white;
+    padding: 0.5rem 1rem;
+    border-radius: 0.25rem;
+    font-weight: 600;
+    border: none;
+    cursor: pointer;
+}
+.btn-success {
+    background-color: #10B981;
+    color: white;
+    padding: 0.5rem 1rem;
+    border-radius: 0.25rem;
+    font-weight: 600;
+    border: none;
+    cursor: pointer;
+}
+.btn-danger {
+    background-color: #EF4444;
+    color: white;
+    padding: 0.5rem 1rem;
+    border-radius: 0.25rem;
+    font-weight: 600;
+    border: none;
+    cursor: pointer;
+}
+.status-label {
+    display: inline-block;
+    padding: 0.25rem 0.5rem;
+    border-radius: 9999px;
+    font-size: 0.75rem;
+    font-weight: 600;
+}
+.status-success {
+    background-color: #D1FAE5;
+    color: #065F46;
+}
+.status-warning {
+    background-color: #FEF3C7;
+    color: #92400E;
+}
+.status-error {
+    background-color: #FEE2E2;
+    color: #B91C1C;
+}
+.footer {
+    text-align: center;
+    margin-top: 2rem;
+    padding-top: 1rem;
+    border-top: 1px solid #E5E7EB;
+    font-size: 0.875rem;
+    color: #6B7280;
+}
+</style>
+""".split())
+
+@st.cache_resource(show_spinner=False)
+def inject_css() -> bool:
+    """カスタムCSSを注入（2回目以降はキャッシュから再生される）"""
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    return True
 
 # UIコンポーネントとページ機能
 class UI:
+    @staticmethod
+    @contextmanager
+    def card(title: str):
+        """見出し付きの枠（カード）を表示し、ブロック内の要素をその中に描画する"""
+        with st.container(border=True):
+            st.header(title)
+            yield
+
     @staticmethod
     def set_page_config():
         """ページの基本設定"""
@@ -337,148 +972,17 @@ class UI:
         )
 
         # カスタムCSS
-        st.markdown("""
-        <style>
-        .main-header {
-            font-size: 2.5rem;
-            color: #1E3A8A;
-            text-align: center;
-            margin-bottom: 2rem;
-            padding-bottom: 1rem;
-            border-bottom: 2px solid #E5E7EB;
-        }
-        .info-box {
-            padding: 1rem;
-            border-radius: 0.5rem;
-            margin-bottom: 1rem;
-        }
-        .info-box-success {
-            background-color: #D1FAE5;
-            border: 1px solid #10B981;
-        }
-        .info-box-warning {
-            background-color: #FEF3C7;
-            border: 1px solid #F59E0B;
-        }
-        .info-box-error {
-            background-color: #FEE2E2;
-            border: 1px solid #EF4444;
-        }
-        .sidebar-header {
-            font-size: 1.5rem;
-            font-weight: 600;
-            margin-bottom: 1rem;
-        }
-        .card {
-            padding: 1.5rem;
-            border-radius: 0.5rem;
-            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1), 0 2px 4px -1px rgba(0, 0, 0, 0.06);
-            background-color: white;
-            margin-bottom: 1rem;
-        }
-        .card-title {
-            font-size: 1.25rem;
-            font-weight: 600;
-            margin-bottom: 0.75rem;
-            color: #1E3A8A;
-        }
-        .metrics-container {
-            display: flex;
-            flex-wrap: wrap;
-            gap: 1rem;
-        }
-        .metric-card {
-            flex: 1;
-            min-width: 200px;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            background-color: #F3F4F6;
-            text-align: center;
-        }
-        .metric-value {
-            font-size: 2rem;
-            font-weight: 700;
-            color: #1E3A8A;
-        }
-        .metric-label {
-            font-size: 0.875rem;
-            color: #6B7280;
-        }
-        .btn-primary {
-            background-color: #1E3A8A;
-            color: white;
-            padding: 0.5rem 1rem;
-            border-radius: 0.25rem;
-            font-weight: 600;
-            border: none;
-            cursor: pointer;
-        }
-        .btn-secondary {
-            background-color: #6B7280;
-            color: white;
-            padding: 0.5rem 1rem;
-            border-radius: 0.25rem;
-            font-weight: 600;
-            border: none;
-            cursor: pointer;
-        }
-        .btn-success {
-            background-color: #10B981;
-            color: white;
-            padding: 0.5rem 1rem;
-            border-radius: 0.25rem;
-            font-weight: 600;
-            border: none;
-            cursor: pointer;
-        }
-        .btn-danger {
-            background-color: #EF4444;
-            color: white;
-            padding: 0.5rem 1rem;
-            border-radius: 0.25rem;
-            font-weight: 600;
-            border: none;
-            cursor: pointer;
-        }
-        .status-label {
-            display: inline-block;
-            padding: 0.25rem 0.5rem;
-            border-radius: 9999px;
-            font-size: 0.75rem;
-            font-weight: 600;
-        }
-        .status-success {
-            background-color: #D1FAE5;
-            color: #065F46;
-        }
-        .status-warning {
-            background-color: #FEF3C7;
-            color: #92400E;
-        }
-        .status-error {
-            background-color: #FEE2E2;
-            color: #B91C1C;
-        }
-        .footer {
-            text-align: center;
-            margin-top: 2rem;
-            padding-top: 1rem;
-            border-top: 1px solid #E5E7EB;
-            font-size: 0.875rem;
-            color: #6B7280;
-        }
-        </style>
-        """, unsafe_allow_html=True)
+        inject_css()
 
     @staticmethod
     def header():
         """アプリヘッダー表示"""
-        st.markdown(f'<h1 class="main-header">{Config.APP_TITLE}</h1>', unsafe_allow_html=True)
+        st.html(f'<h1 class="main-header">{Config.APP_TITLE}</h1>')
 
     @staticmethod
     def sidebar_navigation():
         """サイドバーナビゲーション"""
-        st.sidebar.markdown('<div class="sidebar-header">メニュー</div>', unsafe_allow_html=True)
+        st.sidebar.html('<div class="sidebar-header">メニュー</div>')
 
         # メニューオプション
         menu_options = {
@@ -494,133 +998,184 @@ class UI:
 
         # APIサーバー設定
         st.sidebar.markdown("""---""")
-        st.sidebar.markdown('<div class="sidebar-header">API接続設定</div>', unsafe_allow_html=True)
+        st.sidebar.html('<div class="sidebar-header">API接続設定</div>')
 
+        # セッション状態の参照は一度だけ行い、以降はローカル変数を使う
+        current_base_url = st.session_state.api_base_url
         api_base_url = st.sidebar.text_input(
             "APIサーバーURL", 
-            value=st.session_state.get("api_base_url", Config.DEFAULT_API_BASE_URL),
+            value=current_base_url,
             key="api_base_url_input"
         )
 
-        if api_base_url != st.session_state.get("api_base_url", ""):
+        if api_base_url != current_base_url:
+            # 旧URL向けのクライアント（ログイン中のクッキー）はログアウトで使うため残しておく
             st.session_state.api_base_url = api_base_url
             st.sidebar.success("API接続設定が更新されました")
 
+        # 設定値などのキャッシュを破棄して最新の状態を再取得
+        if st.sidebar.button("キャッシュ更新", key="clear_api_cache"):
+            st.cache_data.clear()
+
+        # 共有している接続プールを閉じ、次の呼び出しから新しい接続で作り直す
+        # （クッキーはセッションごとのクライアントが持つため、どのセッションのログイン状態も保たれる）
+        if st.sidebar.button("API再接続", key="reconnect_api"):
+            get_api(api_base_url).session.close()
+
         # サイドバーフッター
         st.sidebar.markdown("""---""")
         if st.session_state.logged_in:
-            if st.sidebar.button("ログアウト"):
-                api = CashPointPayAPI(st.session_state.api_base_url)
-                api.logout()
+            if st.sidebar.button("ログアウト", key="logout"):
+                # 接続先のURLが途中で変更されていても、ログインした接続先からログアウトする
+                get_api(st.session_state.login_base_url).logout()
                 st.session_state.logged_in = False
-                st.experimental_rerun()
+                st.rerun()
 
         return menu_options[selected_menu]
 
     @staticmethod
     def login_page():
         """ログインページ表示"""
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">ログイン</div>', unsafe_allow_html=True)
+        with UI.card("ログイン"):
 
-        col1, col2 = st.columns([1, 1])
+            col1, col2 = st.columns([1, 1])
 
-        with col1:
-            username = st.text_input("ユーザー名", key="username")
-            password = st.text_input("パスワード", type="password", key="password")
+            with col1:
+                username = st.text_input("ユーザー名", key="username")
+                password = st.text_input("パスワード", type="password", key="password")
 
-            login_button = st.button("ログイン")
+                login_button = st.button("ログイン", key="login")
 
-            if login_button:
-                if not st.session_state.get("api_base_url"):
-                    st.error("APIサーバーのURLを設定してください。")
-                elif not username or not password:
-                    st.error("ユーザー名とパスワードを入力してください。")
-                else:
-                    # 実際のAPIログイン
-                    api = CashPointPayAPI(st.session_state.api_base_url)
-                    response = api.login(username, password)
-
-                    if response.get("isSuccess", False):
-                        st.session_state.logged_in = True
-                        st.session_state.username = username
-                        st.success("ログインに成功しました！")
-                        time.sleep(1)
-                        st.experimental_rerun()
+                if login_button:
+                    if not st.session_state.get("api_base_url"):
+                        st.error("APIサーバーのURLを設定してください。")
+                    elif not username or not password:
+                        st.error("ユーザー名とパスワードを入力してください。")
                     else:
-                        st.error("ログインに失敗しました。ユーザー名とパスワードを確認してください。")
+                        # 実際のAPIログイン
+                        api = get_api(st.session_state.api_base_url)
+                        response = api.login(username, password)
 
-        with col2:
-            st.markdown("""
-            <div style="padding: 1rem; background-color: #F3F4F6; border-radius: 0.5rem;">
-                <h3>Cash Point Payマネジメントシステム</h3>
-                <p>このシステムは、Cash Point Payモジュールの管理および操作のための包括的なインターフェースを提供します。</p>
-                <p>以下の操作が可能です：</p>
-                <ul>
-                    <li>支払い処理</li>
-                    <li>キャッシュ管理</li>
-                    <li>システム設定</li>
-                    <li>モニタリングとレポート</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
+                        if response.get("isSuccess", False):
+                            st.session_state.logged_in = True
+                            st.session_state.login_base_url = api.base_url
+                            # 待たずに再実行し、成功メッセージは次の描画でトースト表示する
+                            st.session_state.pending_toast = ("ログインに成功しました！", "✅")
+                            st.rerun()
+                        else:
+                            st.error("ログインに失敗しました。ユーザー名とパスワードを確認してください。")
 
-        st.markdown('</div>', unsafe_allow_html=True)
+            with col2:
+                st.html("""
+                <div style="padding: 1rem; background-color: #F3F4F6; border-radius: 0.5rem;">
+                    <h3>Cash Point Payマネジメントシステム</h3>
+                    <p>このシステムは、Cash Point Payモジュールの管理および操作のための包括的なインターフェースを提供します。</p>
+                    <p>以下の操作が可能です：</p>
+                    <ul>
+                        <li>支払い処理</li>
+                        <li>キャッシュ管理</li>
+                        <li>システム設定</li>
+                        <li>モニタリングとレポート</li>
+                    </ul>
+                </div>
+                """)
+
+    @staticmethod
+    def stale_notice(response: Dict):
+        """取得に失敗して前回のデータを表示している場合は、その取得時点を明示する"""
+        if response.get("stale"):
+            fetched_at = response["fetchedAt"].strftime("%H:%M:%S")
+            st.html(f"""
+            <div class="info-box info-box-warning">
+                {Messages.STALE_DATA.format(fetched_at=fetched_at)}
+            </div>
+            """)
 
     @staticmethod
     def dashboard_page(api: CashPointPayAPI):
         """ダッシュボードページ表示"""
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">システム概要</div>', unsafe_allow_html=True)
+        with UI.card("システム概要"):
+
+            # キャッシュの保持期間を待たずに最新の状態を取り直す
+            if st.button("最新の情報に更新", key="refresh_dashboard"):
+                cached_status.clear()
+                cached_machine_info.clear()
+                cached_cash_info.clear()
+
+            # 各ブロックはキャッシュの保持期間ごとに、ページ全体を再実行せず個別に更新する
+            UI.dashboard_status(api)
+            UI.dashboard_machine_info(api)
+            UI.dashboard_cash_info(api)
 
-        # システムステータス
-        status_response = api.get_status()
+            # 次に開かれやすいシステム設定のデータを先読み
+            prefetch(api.base_url, lambda: cached_cassette_status(api.base_url))
+
+    @staticmethod
+    @st.fragment(run_every=Config.CACHE_TTL_SHORT)
+    def dashboard_status(api: CashPointPayAPI):
+        """システムステータスの表示"""
+        status_response = cached_status(api.base_url)
 
         if status_response.get("isSuccess", False):
+            UI.stale_notice(status_response)
             status_data = status_response.get("data", {})
 
             col1, col2, col3 = st.columns(3)
 
             with col1:
                 banknote_connected = status_data.get("Banknote Modules Connected", False)
-                banknote_status = "🟢 接続済み" if banknote_connected else "🔴 未接続"
+                banknote_status = Config.CONNECTION_LABELS[bool(banknote_connected)]
                 st.metric("紙幣モジュールステータス", banknote_status)
 
             with col2:
                 coin_connected = status_data.get("Coin Modules Connected", False)
-                coin_status = "🟢 接続済み" if coin_connected else "🔴 未接続"
+                coin_status = Config.CONNECTION_LABELS[bool(coin_connected)]
                 st.metric("硬貨モジュールステータス", coin_status)
 
             with col3:
                 current_status = status_data.get("Status", "不明")
                 st.metric("システムステータス", current_status)
 
-        # 機器情報
-        machine_info_response = api.get_machine_info()
+    @staticmethod
+    @st.fragment(run_every=Config.CACHE_TTL_NORMAL)
+    def dashboard_machine_info(api: CashPointPayAPI):
+        """機器情報とドアステータスの表示"""
+        machine_info_response = cached_machine_info(api.base_url)
 
         if machine_info_response.get("isSuccess", False):
+            UI.stale_notice(machine_info_response)
             machine_data = machine_info_response.get("data", {})
 
             col1, col2 = st.columns(2)
 
             with col1:
                 st.subheader("機器情報")
-                st.write(f"マシンID: {machine_data.get('machineId', '不明')}")
-                st.write(f"シリアル番号: {machine_data.get('serialNumber', '不明')}")
+                st.write(
+                    f"マシンID: {machine_data.get('machineId', '不明')}\n\n"
+                    f"シリアル番号: {machine_data.get('serialNumber', '不明')}"
+                )
 
             with col2:
                 st.subheader("ドアステータス")
                 door_status = machine_data.get("doorStatus", [])
 
+                # ドアごとに書き出さず、1回の描画にまとめる
+                door_lines = []
                 for door in door_status:
                     status = door.get("status", "不明")
-                    status_icon = "🟢" if status.lower() == "closed" else "🔴"
-                    st.write(f"{status_icon} {door.get('name', '不明')}: {status}")
+                    status_icon = Config.DOOR_STATUS_ICONS.get(status.lower(), "🔴")
+                    door_lines.append(f"{status_icon} {door.get('name', '不明')}: {status}")
+                if door_lines:
+                    st.write("\n\n".join(door_lines))
 
-        # キャッシュ情報
-        cash_info_response = api.get_cash_info()
+    @staticmethod
+    @st.fragment(run_every=Config.CACHE_TTL_REALTIME)
+    def dashboard_cash_info(api: CashPointPayAPI):
+        """キャッシュ概要（紙幣・硬貨の一覧と金種分布）の表示"""
+        cash_info_response = cached_cash_info(api.base_url)
 
         if cash_info_response.get("isSuccess", False):
+            UI.stale_notice(cash_info_response)
             cash_data = cash_info_response.get("data", {})
 
             st.subheader("キャッシュ概要")
@@ -632,19 +1187,12 @@ class UI:
                 notes = cash_data.get("note", [])
 
                 if notes:
-                    note_df = pd.DataFrame(notes)
-                    st.dataframe(note_df)
+                    st.dataframe(build_cash_table(notes))
 
                     # 円グラフ - 紙幣の金種分布
                     valid_notes = [note for note in notes if note.get("denomination", 0) < 10000]  # 大きすぎる値を除外
                     if valid_notes:
-                        fig = px.pie(
-                            valid_notes, 
-                            values="amount", 
-                            names="denomination",
-                            title="紙幣の金種分布",
-                            color_discrete_sequence=px.colors.sequential.Blues
-                        )
+                        fig = build_denomination_pie(valid_notes, "紙幣の金種分布", "Blues")
                         st.plotly_chart(fig, use_container_width=True)
 
             with col2:
@@ -652,197 +1200,249 @@ class UI:
                 coins = cash_data.get("coin", [])
 
                 if coins:
-                    coin_df = pd.DataFrame(coins)
-                    st.dataframe(coin_df)
+                    st.dataframe(build_cash_table(coins))
 
                     # 円グラフ - 硬貨の金種分布
                     valid_coins = [coin for coin in coins if coin.get("denomination", 0) > 0]  # 0の値を除外
                     if valid_coins:
-                        fig = px.pie(
-                            valid_coins, 
-                            values="amount", 
-                            names="denomination",
-                            title="硬貨の金種分布",
-                            color_discrete_sequence=px.colors.sequential.Greens
-                        )
+                        fig = build_denomination_pie(valid_coins, "硬貨の金種分布", "Greens")
                         st.plotly_chart(fig, use_container_width=True)
 
-        st.markdown('</div>', unsafe_allow_html=True)
-
     @staticmethod
-    def payment_page(api: CashPointPayAPI):
-        """支払い処理ページ表示"""
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">支払い処理</div>', unsafe_allow_html=True)
-
-        tab1, tab2, tab3 = st.tabs(["単一金額の支払い", "商品リストによる支払い", "POSシステム連携"])
-
-        with tab1:
-            st.subheader("金額指定の支払い")
-            amount = st.text_input("支払い金額", key="payment_amount")
-
-            if st.button("支払い処理開始", key="start_payment"):
-                if amount:
-                    response = api.payment(amount)
-                    if response.get("isSuccess", False):
-                        transaction_data = response.get("data", {})
-                        uuid = transaction_data.get("uuid", "")
-                        st.session_state.current_transaction_uuid = uuid
-                        st.success(f"支払い処理が開始されました。取引ID: {uuid}")
-                    else:
-                        st.error("支払い処理の開始に失敗しました。")
-                else:
-                    st.warning("支払い金額を入力してください。")
+    def run_guarded(key: str, action: Callable[[], Dict]) -> Optional[Dict]:
+        """実行中フラグを立てて変更系の操作を呼び出す（同じ操作が実行中、または直前に完了したばかりならNoneを返す）"""
+        busy_key = f"{key}_busy"
+        finished_key = f"{key}_finished_at"
+        # ダブルクリックなどで完了直後に届いた同じ操作は二重に送らない
+        recently_finished = time.monotonic() - st.session_state.get(finished_key, float("-inf")) < Config.ACTION_DEBOUNCE
+        if st.session_state.get(busy_key, False) or recently_finished:
+            return None
+        st.session_state[busy_key] = True
+        try:
+            return action()
+        finally:
+            st.session_state[busy_key] = False
+            st.session_state[finished_key] = time.monotonic()
 
-        with tab2:
-            st.subheader("商品リストによる支払い")
+    @staticmethod
+    def guarded_action(label: str, key: str, action: Callable[[], Dict]) -> Optional[Dict]:
+        """押下時に変更系の操作を多重送信なしで実行するボタン（押されていない、または送信しなかった場合はNoneを返す）"""
+        if not st.button(label, key=key):
+            return None
+        response = UI.run_guarded(key, action)
+        if response is None:
+            st.info(Messages.ACTION_IN_PROGRESS)
+        return response
 
-            # 動的な商品リスト
-            if "items" not in st.session_state:
-                st.session_state.items = [{"name": "", "pcs": "1", "price": ""}]
+    @staticmethod
+    def run_with_status(name: str, action: Callable[[], Dict]) -> Dict:
+        """時間のかかる操作をst.statusで実行中と表示しながら呼び出す"""
+        with st.status(f"{name}を実行中...") as status:
+            response = action()
+            if response.get("isSuccess", False):
+                status.update(label=f"{name}が完了しました", state="complete")
+            else:
+                status.update(label=f"{name}に失敗しました", state="error")
+        return response
 
-            for i, item in enumerate(st.session_state.items):
-                col1, col2, col3, col4 = st.columns([3, 1, 1, 0.5])
+    @staticmethod
+    def item_editor(key: str) -> Tuple[List[Dict[str, str]], int]:
+        """商品リスト（商品名・数量・単価）を編集するデータエディタを表示し、入力内容と合計金額を返す"""
+        import pandas as pd
+
+        # エディタの初期値は一度だけ作成し、編集内容はエディタ自身の状態に任せる
+        initial_key = f"{key}_initial"
+        if initial_key not in st.session_state:
+            st.session_state[initial_key] = pd.DataFrame([{"name": "", "pcs": "1", "price": ""}])
+
+        edited = st.data_editor(
+            st.session_state[initial_key],
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={"name": "商品名", "pcs": "数量", "price": "単価"},
+            key=f"{key}_editor"
+        )
+        # 追加行の未入力セルはNoneになるため空文字に揃える
+        rows = edited.fillna("").astype(str).apply(lambda column: column.str.strip())
 
-                with col1:
-                    st.session_state.items[i]["name"] = st.text_input(
-                        "商品名", 
-                        value=item["name"], 
-                        key=f"item_name_{i}"
-                    )
+        # 数量・単価がともに整数として入力された行だけを列単位で掛け合わせて合計する
+        pcs = pd.to_numeric(rows["pcs"].where(rows["pcs"].str.isdigit()), errors="coerce")
+        price = pd.to_numeric(rows["price"].where(rows["price"].str.isdigit()), errors="coerce")
+        total = int((pcs * price).fillna(0).sum())
 
-                with col2:
-                    st.session_state.items[i]["pcs"] = st.text_input(
-                        "数量", 
-                        value=item["pcs"], 
-                        key=f"item_pcs_{i}"
-                    )
+        return rows.to_dict(orient="records"), total
 
-                with col3:
-                    st.session_state.items[i]["price"] = st.text_input(
-                        "単価", 
-                        value=item["price"], 
-                        key=f"item_price_{i}"
-                    )
+    @staticmethod
+    def set_current_transaction(uuid: str):
+        """現在の取引IDを記録（ページを再読み込みしても照会できるようURLにも残す）"""
+        st.session_state.current_transaction_uuid = uuid
+        st.query_params[Config.TRANSACTION_QUERY_PARAM] = uuid
 
-                with col4:
-                    if i > 0 and st.button("削除", key=f"remove_item_{i}"):
-                        st.session_state.items.pop(i)
-                        st.experimental_rerun()
+    @staticmethod
+    def payment_page(api: CashPointPayAPI):
+        """支払い処理ページ表示"""
+        with UI.card("支払い処理"):
 
-            if st.button("商品を追加"):
-                st.session_state.items.append({"name": "", "pcs": "1", "price": ""})
-                st.experimental_rerun()
+            tab1, tab2, tab3 = st.tabs(["単一金額の支払い", "商品リストによる支払い", "POSシステム連携"])
 
-            total_amount = sum(int(item["pcs"]) * int(item.get("price", 0)) for item in st.session_state.items if item.get("price", "").isdigit())
-            st.write(f"合計金額: {total_amount}")
+            with tab1:
+                st.subheader("金額指定の支払い")
 
-            if st.button("支払い処理開始", key="start_pay_with_items"):
-                valid_items = [item for item in st.session_state.items if item["name"] and item["pcs"] and item["price"]]
+                # 入力のたびに再実行しないよう、フォームでまとめて送信する
+                with st.form("payment_form"):
+                    amount = st.text_input("支払い金額", key="payment_amount")
+                    payment_submitted = st.form_submit_button("支払い処理開始")
 
-                if valid_items:
-                    response = api.pay(valid_items)
-                    if response.get("isSuccess", False):
-                        transaction_data = response.get("data", {})
-                        uuid = transaction_data.get("uuid", "")
-                        st.session_state.current_transaction_uuid = uuid
-                        st.success(f"支払い処理が開始されました。取引ID: {uuid}")
+                if payment_submitted:
+                    if not amount:
+                        st.warning(Messages.PAYMENT_AMOUNT_REQUIRED)
+                    elif not Config.AMOUNT_PATTERN.fullmatch(amount):
+                        st.warning(Messages.AMOUNT_INVALID)
                     else:
-                        st.error("支払い処理の開始に失敗しました。")
-                else:
-                    st.warning("少なくとも1つの有効な商品を入力してください。")
+                        ok, data, err = unwrap(api.payment(amount))
+                        if ok:
+                            transaction_data = data or {}
+                            uuid = transaction_data.get("uuid", "")
+                            UI.set_current_transaction(uuid)
+                            st.success(Messages.PAYMENT_STARTED.format(uuid=uuid))
+                        else:
+                            st.error(Messages.with_code(Messages.PAYMENT_START_FAILED, err))
 
-        with tab3:
-            st.subheader("POSシステム連携")
+            with tab2:
+                st.subheader("商品リストによる支払い")
 
-            pos_tab1, pos_tab2 = st.tabs(["POSシステム - 商品リスト", "POSシステム - 金額指定"])
+                # 商品リストは1つのデータエディタで編集し（行の追加・削除もエディタ上で行う）、フォームでまとめて送信する
+                with st.form("pay_items_form"):
+                    items, total_amount = UI.item_editor("pay_items")
+                    pay_items_submitted = st.form_submit_button("支払い処理開始")
 
-            with pos_tab1:
-                st.write("POSシステム参照番号と商品リストによる支払い")
+                st.write(f"合計金額: {total_amount}")
 
-                pos_ref = st.text_input("POS参照番号", key="pos_ref_items")
+                if pay_items_submitted:
+                    valid_items = [item for item in items if item["name"] and item["pcs"] and item["price"]]
 
-                # 動的なPOS商品リスト
-                if "pos_items" not in st.session_state:
-                    st.session_state.pos_items = [{"name": "", "pcs": "1", "price": ""}]
+                    if valid_items:
+                        ok, data, err = unwrap(api.pay(valid_items))
+                        if ok:
+                            transaction_data = data or {}
+                            uuid = transaction_data.get("uuid", "")
+                            UI.set_current_transaction(uuid)
+                            st.success(Messages.PAYMENT_STARTED.format(uuid=uuid))
+                        else:
+                            st.error(Messages.with_code(Messages.PAYMENT_START_FAILED, err))
+                    else:
+                        st.warning(Messages.PAY_ITEMS_REQUIRED)
 
-                for i, item in enumerate(st.session_state.pos_items):
-                    col1, col2, col3, col4 = st.columns([3, 1, 1, 0.5])
+            with tab3:
+                st.subheader("POSシステム連携")
 
-                    with col1:
-                        st.session_state.pos_items[i]["name"] = st.text_input(
-                            "商品名", 
-                            value=item["name"], 
-                            key=f"pos_item_name_{i}"
-                        )
+                pos_tab1, pos_tab2 = st.tabs(["POSシステム - 商品リスト", "POSシステム - 金額指定"])
 
-                    with col2:
-                        st.session_state.pos_items[i]["pcs"] = st.text_input(
-                            "数量", 
-                            value=item["pcs"], 
-                            key=f"pos_item_pcs_{i}"
-                        )
+                with pos_tab1:
+                    st.write("POSシステム参照番号と商品リストによる支払い")
 
-                    with col3:
-                        st.session_state.pos_items[i]["price"] = st.text_input(
-                            "単価", 
-                            value=item["price"], 
-                            key=f"pos_item_price_{i}"
-                        )
+                    # POS商品リストも同様にデータエディタで編集し、参照番号と一緒にフォームで送信する
+                    with st.form("pos_pay_form"):
+                        pos_ref = st.text_input("POS参照番号", key="pos_ref_items")
+                        pos_items, pos_total_amount = UI.item_editor("pos_items")
+                        pos_pay_submitted = st.form_submit_button("POS支払い処理開始")
 
-                    with col4:
-                        if i > 0 and st.button("削除", key=f"remove_pos_item_{i}"):
-                            st.session_state.pos_items.pop(i)
-                            st.experimental_rerun()
+                    st.write(f"合計金額: {pos_total_amount}")
 
-                if st.button("商品を追加", key="add_pos_item"):
-                    st.session_state.pos_items.append({"name": "", "pcs": "1", "price": ""})
-                    st.experimental_rerun()
+                    if pos_pay_submitted:
+                        if not pos_ref:
+                            st.warning(Messages.POS_REFERENCE_REQUIRED)
+                        else:
+                            valid_items = [item for item in pos_items if item["name"] and item["pcs"] and item["price"]]
+
+                            if valid_items:
+                                ok, data, err = unwrap(api.pos_pay(valid_items, pos_ref))
+                                if ok:
+                                    transaction_data = data or {}
+                                    uuid = transaction_data.get("uuid", "")
+                                    UI.set_current_transaction(uuid)
+                                    st.success(Messages.POS_PAY_STARTED.format(uuid=uuid))
+                                else:
+                                    st.error(Messages.with_code(Messages.POS_PAY_START_FAILED, err))
+                            else:
+                                st.warning(Messages.PAY_ITEMS_REQUIRED)
+
+                with pos_tab2:
+                    st.write("POSシステム参照番号と金額による支払い")
+
+                    with st.form("pos_payment_form"):
+                        pos_ref_amount = st.text_input("POS参照番号", key="pos_ref_amount")
+                        pos_amount = st.text_input("支払い金額", key="pos_payment_amount")
+                        pos_payment_submitted = st.form_submit_button("POS金額支払い処理開始")
+
+                    if pos_payment_submitted:
+                        if not pos_ref_amount:
+                            st.warning(Messages.POS_REFERENCE_REQUIRED)
+                        elif not pos_amount:
+                            st.warning(Messages.PAYMENT_AMOUNT_REQUIRED)
+                        elif not Config.AMOUNT_PATTERN.fullmatch(pos_amount):
+                            st.warning(Messages.AMOUNT_INVALID)
+                        else:
+                            ok, data, err = unwrap(api.pos_payment(pos_amount, pos_ref_amount))
+                            if ok:
+                                transaction_data = data or {}
+                                uuid = transaction_data.get("uuid", "")
+                                UI.set_current_transaction(uuid)
+                                st.success(Messages.POS_PAYMENT_STARTED.format(uuid=uuid))
+                            else:
+                                st.error(Messages.with_code(Messages.POS_PAYMENT_START_FAILED, err))
 
-                pos_total_amount = sum(int(item["pcs"]) * int(item.get("price", 0)) for item in st.session_state.pos_items if item.get("price", "").isdigit())
-                st.write(f"合計金額: {pos_total_amount}")
+            # 取引ステータス確認セクション（照会の操作はこの枠の中だけで再実行する）
+            st.markdown("""---""")
+            UI.transaction_status_section(api)
 
-                if st.button("POS支払い処理開始", key="start_pos_pay"):
-                    if not pos_ref:
-                        st.warning("POS参照番号を入力してください。")
-                    else:
-                        valid_items = [item for item in st.session_state.pos_items if item["name"] and item["pcs"] and item["price"]]
+            # トランザクション操作セクション
+            st.markdown("""---""")
+            st.subheader("取引操作")
 
-                        if valid_items:
-                            response = api.pos_pay(valid_items, pos_ref)
-                            if response.get("isSuccess", False):
-                                transaction_data = response.get("data", {})
-                                uuid = transaction_data.get("uuid", "")
-                                st.session_state.current_transaction_uuid = uuid
-                                st.success(f"POS支払い処理が開始されました。取引ID: {uuid}")
-                            else:
-                                st.error("POS支払い処理の開始に失敗しました。")
-                        else:
-                            st.warning("少なくとも1つの有効な商品を入力してください。")
+            col1, col2, col3, col4 = st.columns(4)
 
-            with pos_tab2:
-                st.write("POSシステム参照番号と金額による支払い")
+            with col1:
+                response = UI.guarded_action("キャンセル", "cancel_transaction", api.cancel)
+                if response is not None:
+                    ok, data, err = unwrap(response)
+                    if ok:
+                        st.success(Messages.TRANSACTION_CANCELLED)
+                    else:
+                        st.error(Messages.with_code(Messages.TRANSACTION_CANCEL_FAILED, err))
 
-                pos_ref_amount = st.text_input("POS参照番号", key="pos_ref_amount")
-                pos_amount = st.text_input("支払い金額", key="pos_payment_amount")
+            with col2:
+                response = UI.guarded_action("停止", "stop_transaction", api.payment_stop)
+                if response is not None:
+                    ok, data, err = unwrap(response)
+                    if ok:
+                        st.success(Messages.TRANSACTION_STOPPED)
+                    else:
+                        st.error(Messages.with_code(Messages.TRANSACTION_STOP_FAILED, err))
 
-                if st.button("POS金額支払い処理開始", key="start_pos_payment"):
-                    if not pos_ref_amount:
-                        st.warning("POS参照番号を入力してください。")
-                    elif not pos_amount:
-                        st.warning("支払い金額を入力してください。")
+            with col3:
+                response = UI.guarded_action("続行", "continue_transaction", api.payment_continue)
+                if response is not None:
+                    ok, data, err = unwrap(response)
+                    if ok:
+                        st.success(Messages.TRANSACTION_CONTINUED)
                     else:
-                        response = api.pos_payment(pos_amount, pos_ref_amount)
-                        if response.get("isSuccess", False):
-                            transaction_data = response.get("data", {})
-                            uuid = transaction_data.get("uuid", "")
-                            st.session_state.current_transaction_uuid = uuid
-                            st.success(f"POS金額支払い処理が開始されました。取引ID: {uuid}")
-                        else:
-                            st.error("POS金額支払い処理の開始に失敗しました。")
+                        st.error(Messages.with_code(Messages.TRANSACTION_CONTINUE_FAILED, err))
+
+            with col4:
+                response = UI.guarded_action("リセット", "reset_status", api.reset_status)
+                if response is not None:
+                    ok, data, err = unwrap(response)
+                    if ok:
+                        cached_status.clear()
+                        st.success(Messages.STATUS_RESET_DONE)
+                    else:
+                        st.error(Messages.with_code(Messages.STATUS_RESET_FAILED, err))
 
-        # 取引ステータス確認セクション
-        st.markdown("""---""")
+    @staticmethod
+    @st.fragment
+    def transaction_status_section(api: CashPointPayAPI):
+        """取引ステータス確認の表示"""
         st.subheader("取引ステータス確認")
 
         col1, col2 = st.columns([3, 1])
@@ -857,770 +1457,812 @@ class UI:
         with col2:
             if st.button("ステータス確認", key="check_transaction"):
                 if transaction_uuid:
-                    response = api.query(transaction_uuid)
-                    if response.get("isSuccess", False):
-                        transaction_data = response.get("data", {})
-
-                        # トランザクション詳細を表示
-                        st.json(transaction_data)
-
-                        # インフォボックスでステータスをハイライト
-                        info = transaction_data.get("info", {})
-                        status = info.get("status", "不明")
-
-                        status_class = "info-box-success"
-                        if status in ["Payment Error", "user cancelled", "no change"]:
-                            status_class = "info-box-error"
-                        elif status in ["paying", "processing"]:
-                            status_class = "info-box-warning"
-
-                        st.markdown(f"""
-                        <div class="info-box {status_class}">
-                            <strong>取引ステータス:</strong> {status}<br>
-                            <strong>支払い金額:</strong> {info.get("pay_amount", 0)}<br>
-                            <strong>お釣り:</strong> {info.get("change", 0)}<br>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.error("取引ステータスの取得に失敗しました。")
+                    # 処理中の間は同じ枠を書き換えながら照会を繰り返す
+                    placeholder = st.empty()
+                    for response in api.poll_query(transaction_uuid):
+                        with placeholder.container():
+                            ok, data, err = unwrap(response)
+                            if ok:
+                                transaction_data = data or {}
+
+                                # トランザクション詳細を表示
+                                st.json(transaction_data)
+
+                                # インフォボックスでステータスをハイライト
+                                info = transaction_data.get("info", {})
+                                status = info.get("status", "不明")
+
+                                status_class = Config.TRANSACTION_STATUS_CLASSES.get(status, "info-box-success")
+
+                                st.html(f"""
+                                <div class="info-box {status_class}">
+                                    <strong>取引ステータス:</strong> {html.escape(str(status))}<br>
+                                    <strong>支払い金額:</strong> {html.escape(str(info.get("pay_amount", 0)))}<br>
+                                    <strong>お釣り:</strong> {html.escape(str(info.get("change", 0)))}<br>
+                                </div>
+                                """)
+                            else:
+                                st.error(Messages.with_code(Messages.TRANSACTION_STATUS_FETCH_FAILED, err))
                 else:
-                    st.warning("取引IDを入力してください。")
+                    st.warning(Messages.TRANSACTION_ID_REQUIRED)
 
-        # トランザクション操作セクション
-        st.markdown("""---""")
-        st.subheader("取引操作")
+    @staticmethod
+    def cash_management_page(api: CashPointPayAPI):
+        """キャッシュマネジメントページ表示"""
+        with UI.card("キャッシュマネジメント"):
 
-        col1, col2, col3, col4 = st.columns(4)
+            tab1, tab2, tab3, tab4 = st.tabs(["現金情報", "補充/払い戻し", "ドラム管理", "キャッシュ操作"])
 
-        with col1:
-            if st.button("キャンセル", key="cancel_transaction"):
-                response = api.cancel()
-                if response.get("isSuccess", False):
-                    st.success("取引がキャンセルされました。")
-                else:
-                    st.error("取引のキャンセルに失敗しました。")
+            with tab1:
+                UI.cash_info_tab(api)
 
-        with col2:
-            if st.button("停止", key="stop_transaction"):
-                response = api.payment_stop()
-                if response.get("isSuccess", False):
-                    st.success("取引が停止されました。")
-                else:
-                    st.error("取引の停止に失敗しました。")
-
-        with col3:
-            if st.button("続行", key="continue_transaction"):
-                response = api.payment_continue()
-                if response.get("isSuccess", False):
-                    st.success("取引が再開されました。")
-                else:
-                    st.error("取引の再開に失敗しました。")
+            with tab2:
+                UI.refill_refund_tab(api)
 
-        with col4:
-            if st.button("リセット", key="reset_status"):
-                response = api.reset_status()
-                if response.get("isSuccess", False):
-                    st.success("システムステータスがリセットされました。")
-                else:
-                    st.error("システムステータスのリセットに失敗しました。")
+            with tab3:
+                UI.drum_management_tab(api)
 
-        st.markdown('</div>', unsafe_allow_html=True)
+            with tab4:
+                UI.withdraw_tab(api)
 
     @staticmethod
-    def cash_management_page(api: CashPointPayAPI):
-        """キャッシュマネジメントページ表示"""
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">キャッシュマネジメント</div>', unsafe_allow_html=True)
+    def cash_info_tab(api: CashPointPayAPI):
+        """現金情報タブ（一覧は自動更新し、ドラム詳細は自動更新で消えないよう別の枠で表示する）"""
+        st.subheader("現金情報")
 
-        tab1, tab2, tab3, tab4 = st.tabs(["現金情報", "補充/払い戻し", "ドラム管理", "キャッシュ操作"])
+        UI.cash_info_tables(api)
 
-        with tab1:
-            st.subheader("現金情報")
-
-            if st.button("現金情報更新", key="refresh_cash_info"):
-                st.session_state.cash_info = api.get_cash_info()
+        st.markdown("""---""")
+        UI.drum_detail_panel(api)
 
-            cash_info_response = st.session_state.get("cash_info") or api.get_cash_info()
+    @staticmethod
+    @st.fragment(run_every=Config.CACHE_TTL_REALTIME)
+    def cash_info_tables(api: CashPointPayAPI):
+        """紙幣・硬貨の在庫一覧（一定間隔で自動更新し、操作時もこの部分だけを再実行する）"""
+        if st.button("現金情報更新", key="refresh_cash_info"):
+            cached_cash_info.clear()
 
-            if cash_info_response.get("isSuccess", False):
-                cash_data = cash_info_response.get("data", {})
+        cash_info_response = cached_cash_info(api.base_url)
 
-                col1, col2 = st.columns(2)
+        if cash_info_response.get("isSuccess", False):
+            UI.stale_notice(cash_info_response)
+            cash_data = cash_info_response.get("data", {})
 
-                with col1:
-                    st.write("紙幣情報")
-                    notes = cash_data.get("note", [])
+            col1, col2 = st.columns(2)
 
-                    if notes:
-                        note_df = pd.DataFrame(notes)
+            with col1:
+                st.write("紙幣情報")
+                notes = cash_data.get("note", [])
 
-                        # 紙幣合計金額
-                        total_note_amount = sum(note.get("amount", 0) for note in notes)
-                        st.metric("紙幣合計金額", f"{total_note_amount}")
+                if notes:
+                    note_df = build_cash_table(notes)
 
-                        # データテーブル
-                        st.dataframe(note_df)
+                    # 紙幣合計金額（表示用に作成済みのDataFrameで列ごとに集計）
+                    total_note_amount = int(note_df["amount"].fillna(0).sum())
+                    st.metric("紙幣合計金額", f"{total_note_amount}")
 
-                        # 各ドラムの詳細情報の取得
-                        st.write("ドラム詳細情報")
-                        selected_drum = st.selectbox(
-                            "ドラムを選択", 
-                            [note.get("name") for note in notes],
-                            key="selected_drum"
-                        )
+                    # データテーブル
+                    st.dataframe(note_df)
 
-                        if st.button("詳細情報を表示", key="show_drum_detail"):
-                            drum_detail_response = api.get_cash_detail_info(selected_drum)
-                            if drum_detail_response.get("isSuccess", False):
-                                drum_detail = drum_detail_response.get("data", {})
-                                st.json(drum_detail)
-                            else:
-                                st.error("ドラム詳細情報の取得に失敗しました。")
-
-                with col2:
-                    st.write("硬貨情報")
-                    coins = cash_data.get("coin", [])
-
-                    if coins:
-                        coin_df = pd.DataFrame(coins)
-
-                        # 硬貨合計金額
-                        total_coin_amount = sum(coin.get("amount", 0) for coin in coins)
-                        st.metric("硬貨合計金額", f"{total_coin_amount}")
-
-                        # データテーブル
-                        st.dataframe(coin_df)
-
-                        # 棒グラフ - 硬貨在庫
-                        valid_coins = [coin for coin in coins if coin.get("denomination", 0) > 0]
-                        if valid_coins:
-                            fig = px.bar(
-                                valid_coins,
-                                x="denomination",
-                                y="pcs",
-                                color="name",
-                                title="硬貨在庫状況",
-                                labels={"denomination": "金種", "pcs": "枚数", "name": "場所"}
-                            )
-                            st.plotly_chart(fig, use_container_width=True)
-            else:
-                st.error("現金情報の取得に失敗しました。")
+            with col2:
+                st.write("硬貨情報")
+                coins = cash_data.get("coin", [])
 
-        with tab2:
-            st.subheader("補充/払い戻し操作")
+                if coins:
+                    coin_df = build_cash_table(coins)
 
-            col1, col2 = st.columns(2)
+                    # 硬貨合計金額
+                    total_coin_amount = int(coin_df["amount"].fillna(0).sum())
+                    st.metric("硬貨合計金額", f"{total_coin_amount}")
 
-            with col1:
-                st.write("補充操作")
+                    # データテーブル
+                    st.dataframe(coin_df)
 
-                if st.button("補充開始", key="start_refill"):
-                    response = api.refill()
-                    if response.get("isSuccess", False):
-                        transaction_data = response.get("data", {})
-                        uuid = transaction_data.get("uuid", "")
-                        st.session_state.current_refill_uuid = uuid
-                        st.success(f"補充プロセスが開始されました。ID: {uuid}")
-                    else:
-                        st.error("補充プロセスの開始に失敗しました。")
+                    # 棒グラフ - 硬貨在庫
+                    valid_coins = [coin for coin in coins if coin.get("denomination", 0) > 0]
+                    if valid_coins:
+                        st.plotly_chart(build_coin_stock_bar(valid_coins), use_container_width=True)
+        else:
+            st.error(Messages.CASH_INFO_FETCH_FAILED)
 
-                if st.button("補充終了", key="end_refill"):
-                    response = api.refill_end()
-                    if response.get("isSuccess", False):
-                        st.success("補充プロセスが完了しました。")
-                    else:
-                        st.error("補充プロセスの終了に失敗しました。")
+    @staticmethod
+    @st.fragment
+    def drum_detail_panel(api: CashPointPayAPI):
+        """ドラム詳細情報（自動更新しないため、表示した詳細は次の操作まで残る）"""
+        st.write("ドラム詳細情報")
+
+        # ドラム名の一覧は在庫一覧と同じキャッシュから取る
+        cash_info_response = cached_cash_info(api.base_url)
+        notes = cash_info_response.get("data", {}).get("note", []) if cash_info_response.get("isSuccess", False) else []
+
+        if notes:
+            selected_drum = st.selectbox(
+                "ドラムを選択", 
+                [note.get("name") for note in notes],
+                key="selected_drum"
+            )
 
-            with col2:
-                st.write("払い戻し操作")
+            if st.button("詳細情報を表示", key="show_drum_detail"):
+                drum_detail_response = api.get_cash_detail_info(selected_drum)
+                if drum_detail_response.get("isSuccess", False):
+                    drum_detail = drum_detail_response.get("data", {})
+                    st.json(drum_detail)
+                else:
+                    st.error(Messages.DRUM_DETAIL_FETCH_FAILED)
 
-                refund_amount = st.text_input("払い戻し金額", key="refund_amount")
+    @staticmethod
+    @st.fragment
+    def refill_refund_tab(api: CashPointPayAPI):
+        """補充/払い戻しタブ（操作時はこの部分だけを再実行する）"""
+        st.subheader("補充/払い戻し操作")
 
-                if st.button("払い戻し実行", key="execute_refund"):
-                    if refund_amount:
-                        response = api.refund(refund_amount)
-                        if response.get("isSuccess", False):
-                            transaction_data = response.get("data", {})
-                            uuid = transaction_data.get("uuid", "")
-                            st.session_state.current_refund_uuid = uuid
-                            st.success(f"払い戻しプロセスが開始されました。ID: {uuid}")
-                        else:
-                            st.error("払い戻しプロセスの開始に失敗しました。")
-                    else:
-                        st.warning("払い戻し金額を入力してください。")
+        col1, col2 = st.columns(2)
 
-        with tab3:
-            st.subheader("ドラム管理")
+        with col1:
+            st.write("補充操作")
+
+            response = UI.guarded_action("補充開始", "start_refill", api.refill)
+            if response is not None:
+                ok, data, err = unwrap(response)
+                if ok:
+                    transaction_data = data or {}
+                    uuid = transaction_data.get("uuid", "")
+                    st.session_state.current_refill_uuid = uuid
+                    st.success(Messages.REFILL_STARTED.format(uuid=uuid))
+                else:
+                    st.error(Messages.with_code(Messages.REFILL_START_FAILED, err))
 
-            col1, col2 = st.columns(2)
+            response = UI.guarded_action("補充終了", "end_refill", api.refill_end)
+            if response is not None:
+                ok, data, err = unwrap(response)
+                if ok:
+                    st.success(Messages.REFILL_ENDED)
+                else:
+                    st.error(Messages.with_code(Messages.REFILL_END_FAILED, err))
 
-            with col1:
-                st.write("ドラムからカセットへの移動")
+        with col2:
+            st.write("払い戻し操作")
 
-                drum_id = st.number_input("ドラムID (1-4)", min_value=1, max_value=4, value=1, step=1, key="drum_id")
-                drum_pcs = st.number_input("移動枚数", min_value=1, value=1, step=1, key="drum_pcs")
+            refund_amount = st.text_input("払い戻し金額", key="refund_amount")
 
-                if st.button("移動実行", key="execute_drum_to_cassette"):
-                    response = api.drum_to_cassette(drum_id, drum_pcs)
-                    if response.get("isSuccess", False):
-                        st.success(f"ドラム {drum_id} からカセットに {drum_pcs} 枚の紙幣が移動されました。")
+            if st.button("払い戻し実行", key="execute_refund"):
+                if not refund_amount:
+                    st.warning(Messages.REFUND_AMOUNT_REQUIRED)
+                elif not Config.AMOUNT_PATTERN.fullmatch(refund_amount):
+                    st.warning(Messages.AMOUNT_INVALID)
+                else:
+                    response = UI.run_guarded("execute_refund", lambda: api.refund(refund_amount))
+                    ok, data, err = unwrap(response)
+                    if response is None:
+                        st.info(Messages.ACTION_IN_PROGRESS)
+                    elif ok:
+                        transaction_data = data or {}
+                        uuid = transaction_data.get("uuid", "")
+                        st.session_state.current_refund_uuid = uuid
+                        st.success(Messages.REFUND_STARTED.format(uuid=uuid))
                     else:
-                        st.error("紙幣の移動に失敗しました。")
+                        st.error(Messages.with_code(Messages.REFUND_START_FAILED, err))
 
-            with col2:
-                st.write("カセット/コインボックスのリセット")
+    @staticmethod
+    @st.fragment
+    def drum_management_tab(api: CashPointPayAPI):
+        """ドラム管理タブ（操作時はこの部分だけを再実行する）"""
+        st.subheader("ドラム管理")
 
-                col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-                with col1:
-                    if st.button("カセットリセット", key="reset_cassette"):
-                        response = api.reset_cassette()
-                        if response.get("isSuccess", False):
-                            st.success("カセットカウントがリセットされました。")
-                        else:
-                            st.error("カセットリセットに失敗しました。")
+        with col1:
+            st.write("ドラムからカセットへの移動")
 
-                with col2:
-                    if st.button("コインボックスリセット", key="reset_coin_box"):
-                        response = api.reset_coin_box()
-                        if response.get("isSuccess", False):
-                            st.success("コインボックスカウントがリセットされました。")
-                        else:
-                            st.error("コインボックスリセットに失敗しました。")
-
-        with tab4:
-            st.subheader("引き出し操作")
-
-            st.write("特定の紙幣・硬貨を引き出し")
-
-            # 引き出しアイテムリスト
-            if "withdraw_items" not in st.session_state:
-                st.session_state.withdraw_items = [{"iscoin": False, "pcs": 1, "deno": 100}]
-
-            for i, item in enumerate(st.session_state.withdraw_items):
-                col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
-
-                with col1:
-                    st.session_state.withdraw_items[i]["iscoin"] = st.selectbox(
-                        "種類", 
-                        [("硬貨", True), ("紙幣", False)],
-                        format_func=lambda x: x[0],
-                        index=1 if not item["iscoin"] else 0,
-                        key=f"withdraw_type_{i}"
-                    )[1]
-
-                with col2:
-                    st.session_state.withdraw_items[i]["pcs"] = st.number_input(
-                        "枚数", 
-                        min_value=0,
-                        value=item["pcs"],
-                        key=f"withdraw_pcs_{i}"
-                    )
+            drum_id = st.number_input("ドラムID (1-4)", min_value=1, max_value=4, value=1, step=1, key="drum_id")
+            drum_pcs = st.number_input("移動枚数", min_value=1, value=1, step=1, key="drum_pcs")
 
-                with col3:
-                    denominations = [1, 5, 10, 50, 100, 500, 1000, 5000, 10000]
-                    st.session_state.withdraw_items[i]["deno"] = st.selectbox(
-                        "金種", 
-                        denominations,
-                        index=denominations.index(item["deno"]) if item["deno"] in denominations else 4,
-                        key=f"withdraw_deno_{i}"
-                    )
-
-                with col4:
-                    if i > 0 and st.button("削除", key=f"remove_withdraw_{i}"):
-                        st.session_state.withdraw_items.pop(i)
-                        st.experimental_rerun()
+            response = UI.guarded_action("移動実行", "execute_drum_to_cassette", lambda: api.drum_to_cassette(drum_id, drum_pcs))
+            if response is not None:
+                ok, data, err = unwrap(response)
+                if ok:
+                    st.success(Messages.DRUM_TO_CASSETTE_DONE.format(drum_id=drum_id, drum_pcs=drum_pcs))
+                else:
+                    st.error(Messages.with_code(Messages.DRUM_TO_CASSETTE_FAILED, err))
 
-            if st.button("アイテムを追加", key="add_withdraw_item"):
-                st.session_state.withdraw_items.append({"iscoin": False, "pcs": 1, "deno": 100})
-                st.experimental_rerun()
+        with col2:
+            st.write("カセット/コインボックスのリセット")
 
-            # 合計金額計算
-            total_withdraw = sum(item["pcs"] * item["deno"] for item in st.session_state.withdraw_items)
-            st.write(f"合計引き出し金額: {total_withdraw}")
+            col1, col2 = st.columns(2)
 
-            if st.button("引き出し実行", key="execute_withdraw"):
-                valid_items = [item for item in st.session_state.withdraw_items if item["pcs"] > 0]
+            with col1:
+                response = UI.guarded_action("カセットリセット", "reset_cassette", api.reset_cassette)
+                if response is not None:
+                    ok, data, err = unwrap(response)
+                    if ok:
+                        st.success(Messages.CASSETTE_RESET_DONE)
+                    else:
+                        st.error(Messages.with_code(Messages.CASSETTE_RESET_FAILED, err))
 
-                if valid_items:
-                    response = api.withdraw(valid_items)
-                    if response.get("isSuccess", False):
-                        transaction_data = response.get("data", {})
-                        uuid = transaction_data.get("uuid", "")
-                        st.session_state.current_withdraw_uuid = uuid
-                        st.success(f"引き出しプロセスが開始されました。ID: {uuid}")
+            with col2:
+                response = UI.guarded_action("コインボックスリセット", "reset_coin_box", api.reset_coin_box)
+                if response is not None:
+                    ok, data, err = unwrap(response)
+                    if ok:
+                        st.success(Messages.COIN_BOX_RESET_DONE)
                     else:
-                        st.error("引き出しプロセスの開始に失敗しました。")
-                else:
-                    st.warning("少なくとも1つのアイテムの枚数を1以上に設定してください。")
+                        st.error(Messages.with_code(Messages.COIN_BOX_RESET_FAILED, err))
 
-        st.markdown('</div>', unsafe_allow_html=True)
+    @staticmethod
+    @st.fragment
+    def withdraw_tab(api: CashPointPayAPI):
+        """引き出し操作タブ（操作時はこの部分だけを再実行する）"""
+        import pandas as pd
+
+        st.subheader("引き出し操作")
+
+        st.write("特定の紙幣・硬貨を引き出し")
+
+        # 引き出しアイテムリスト（エディタの初期値は一度だけ作成し、編集内容はエディタに任せる）
+        if "withdraw_items_initial" not in st.session_state:
+            st.session_state.withdraw_items_initial = pd.DataFrame([{"iscoin": False, "pcs": 1, "deno": 100}])
+
+        # 入力のたびに再実行しないよう、アイテム表はフォームでまとめて送信する
+        with st.form("withdraw_form"):
+            edited_withdraw = st.data_editor(
+                st.session_state.withdraw_items_initial,
+                num_rows="dynamic",
+                use_container_width=True,
+                column_config={
+                    "iscoin": st.column_config.CheckboxColumn("硬貨", default=False),
+                    "pcs": st.column_config.NumberColumn("枚数", min_value=0, step=1, default=1),
+                    "deno": st.column_config.SelectboxColumn("金種", options=Config.DENOMINATIONS, default=100)
+                },
+                key="withdraw_editor"
+            )
+            withdraw_submitted = st.form_submit_button("引き出し実行")
+
+        # 追加行の未入力セルを除き、APIに渡せる組み込み型に揃える
+        withdraw_rows = edited_withdraw.dropna(subset=["pcs", "deno"])
+        withdraw_items = [
+            {"iscoin": bool(row["iscoin"]), "pcs": int(row["pcs"]), "deno": int(row["deno"])}
+            for row in withdraw_rows.to_dict(orient="records")
+        ]
+
+        # 合計金額計算（列同士を掛け合わせて集計）
+        total_withdraw = int((withdraw_rows["pcs"] * withdraw_rows["deno"]).sum())
+        st.write(f"合計引き出し金額: {total_withdraw}")
+
+        if withdraw_submitted:
+            valid_items = [item for item in withdraw_items if item["pcs"] > 0]
+
+            if valid_items:
+                response = UI.run_guarded("execute_withdraw", lambda: api.withdraw(valid_items))
+                ok, data, err = unwrap(response)
+                if response is None:
+                    st.info(Messages.ACTION_IN_PROGRESS)
+                elif ok:
+                    transaction_data = data or {}
+                    uuid = transaction_data.get("uuid", "")
+                    st.session_state.current_withdraw_uuid = uuid
+                    st.success(Messages.WITHDRAW_STARTED.format(uuid=uuid))
+                else:
+                    st.error(Messages.with_code(Messages.WITHDRAW_START_FAILED, err))
+            else:
+                st.warning(Messages.WITHDRAW_ITEMS_REQUIRED)
 
     @staticmethod
     def system_settings_page(api: CashPointPayAPI):
         """システム設定ページ表示"""
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">システム設定</div>', unsafe_allow_html=True)
+        with UI.card("システム設定"):
+
+            # 各タブの参照データは互いに独立しているため、タブを順に描画する前にまとめて並行取得を始める
+            prefetch(
+                api.base_url,
+                lambda: cached_banknote_setup(api.base_url),
+                lambda: cached_coin_setup(api.base_url),
+                lambda: cached_machine_info(api.base_url),
+                lambda: cached_sensor_status(api.base_url),
+                lambda: cached_cassette_status(api.base_url)
+            )
 
-        tab1, tab2, tab3, tab4, tab5 = st.tabs(["一般設定", "紙幣設定", "硬貨設定", "ドア制御", "センサー状態"])
+            tab1, tab2, tab3, tab4, tab5 = st.tabs(["一般設定", "紙幣設定", "硬貨設定", "ドア制御", "センサー状態"])
 
-        with tab1:
-            st.subheader("一般設定")
+            with tab1:
+                UI.general_settings_tab(api)
 
-            # ステータス操作
-            col1, col2, col3 = st.columns(3)
+            with tab2:
+                UI.banknote_settings_tab(api)
 
-            with col1:
-                if st.button("ステータスリセット", key="reset_system_status"):
-                    response = api.reset_status()
-                    if response.get("isSuccess", False):
-                        st.success("システムステータスがリセットされました。")
-                    else:
-                        st.error("システムステータスのリセットに失敗しました。")
+            with tab3:
+                UI.coin_settings_tab(api)
 
-            with col2:
-                if st.button("自己診断テスト実行", key="run_self_test"):
-                    response = api.self_test()
-                    if response.get("isSuccess", False):
-                        st.success("自己診断テストが正常に実行されました。")
-                    else:
-                        st.error("自己診断テストの実行に失敗しました。")
+            with tab4:
+                UI.door_control_tab(api)
 
-            with col3:
-                if st.button("キャリブレーション実行", key="run_calibration"):
-                    response = api.pd_calibration()
-                    if response.get("isSuccess", False):
-                        st.success("紙幣モジュールのキャリブレーションが正常に実行されました。")
-                    else:
-                        st.error("キャリブレーションの実行に失敗しました。")
-
-            # デバイス設定
-            st.markdown("""---""")
-            st.write("デバイス設定")
-
-            col1, col2 = st.columns(2)
+            with tab5:
+                UI.sensor_status_tab(api)
 
-            with col1:
-                device_id = st.text_input("デバイスID", value="CPP-", key="device_id")
+    @staticmethod
+    @st.fragment
+    def general_settings_tab(api: CashPointPayAPI):
+        """一般設定タブ（操作時はこの部分だけを再実行する）"""
+        st.subheader("一般設定")
 
-            with col2:
-                device_url = st.text_input("URL", key="device_url")
+        # ステータス操作
+        col1, col2, col3 = st.columns(3)
 
-            if st.button("デバイス設定保存", key="save_device_settings"):
-                if device_id and device_url:
-                    response = api.set_device_setting(device_id, device_url)
-                    if response.get("isSuccess", False):
-                        st.success("デバイス設定が保存されました。")
-                    else:
-                        st.error("デバイス設定の保存に失敗しました。")
+        with col1:
+            response = UI.guarded_action("ステータスリセット", "reset_system_status", api.reset_status)
+            if response is not None:
+                ok, data, err = unwrap(response)
+                if ok:
+                    cached_status.clear()
+                    st.success(Messages.STATUS_RESET_DONE)
                 else:
-                    st.warning("デバイスIDとURLを入力してください。")
+                    st.error(Messages.with_code(Messages.STATUS_RESET_FAILED, err))
 
-            # ユーザー設定
-            st.markdown("""---""")
-            st.write("ユーザー設定")
-
-            setting_name = st.selectbox(
-                "設定名", 
-                [
-                    "hasCoinPocketSensor", 
-                    "refillBanknoteByDepositMode", 
-                    "disablePrintReceiptForTransaction"
-                ],
-                key="setting_name"
+        with col2:
+            response = UI.guarded_action(
+                "自己診断テスト実行", "run_self_test",
+                lambda: UI.run_with_status("自己診断テスト", api.self_test)
             )
-
-            setting_value = st.radio(
-                "値", 
-                [("有効", 1), ("無効", 0)],
-                format_func=lambda x: x[0],
-                key="setting_value"
-            )[1]
-
-            st.write(setting_name + "の説明:")
-            if setting_name == "hasCoinPocketSensor":
-                st.write("硬貨モジュールが存在する場合、この機能を有効にすると硬貨モジュールをサポートします。")
-            elif setting_name == "refillBanknoteByDepositMode":
-                st.write("有効にすると、補充モードでドラムに入ることができない紙幣はカセットに転送されます。無効にすると、リジェクトポケットに転送されます。")
-            elif setting_name == "disablePrintReceiptForTransaction":
-                st.write("トランザクション中にレシート印刷機能を無効にします。")
-
-            if st.button("設定を保存", key="save_user_setting"):
-                response = api.setup_setting(setting_name, setting_value)
-                if response.get("isSuccess", False):
-                    st.success("ユーザー設定が保存されました。")
+            if response is not None:
+                ok, data, err = unwrap(response)
+                if ok:
+                    st.success(Messages.SELF_TEST_DONE)
                 else:
-                    st.error("ユーザー設定の保存に失敗しました。")
-
-            # ホッパークリア
-            st.markdown("""---""")
-            st.write("ホッパークリア")
-
-            hopper_id = st.selectbox(
-                "ホッパーID", 
-                [("すべてのホッパー", -1), ("ホッパー1", 1), ("ホッパー2", 2), ("ホッパー3", 3), ("ホッパー4", 4), ("ホッパー5", 5), ("ホッパー6", 6)],
-                format_func=lambda x: x[0],
-                key="hopper_id"
-            )[1]
+                    st.error(Messages.with_code(Messages.SELF_TEST_FAILED, err))
 
-            if st.button("ホッパークリア実行", key="clear_hopper"):
-                response = api.clear_hopper(hopper_id)
-                if response.get("isSuccess", False):
-                    st.success(f"ホッパークリアが正常に実行されました。")
+        with col3:
+            response = UI.guarded_action(
+                "キャリブレーション実行", "run_calibration",
+                lambda: UI.run_with_status("キャリブレーション", api.pd_calibration)
+            )
+            if response is not None:
+                ok, data, err = unwrap(response)
+                if ok:
+                    st.success(Messages.CALIBRATION_DONE)
                 else:
-                    st.error("ホッパークリアの実行に失敗しました。")
+                    st.error(Messages.with_code(Messages.CALIBRATION_FAILED, err))
 
-        with tab2:
-            st.subheader("紙幣モジュール設定")
+        # デバイス設定
+        st.markdown("""---""")
+        st.write("デバイス設定")
+
+        col1, col2 = st.columns(2)
 
-            if st.button("紙幣設定読み込み", key="load_banknote_settings"):
-                st.session_state.banknote_settings = api.get_banknote_denomination_setup()
+        with col1:
+            device_id = st.text_input("デバイスID", value="CPP-", key="device_id")
 
-            banknote_settings_response = st.session_state.get("banknote_settings") or api.get_banknote_denomination_setup()
+        with col2:
+            device_url = st.text_input("URL", key="device_url")
+
+        if st.button("デバイス設定保存", key="save_device_settings"):
+            if device_id and device_url:
+                response = UI.run_guarded("save_device_settings", lambda: api.set_device_setting(device_id, device_url))
+                ok, data, err = unwrap(response)
+                if response is None:
+                    st.info(Messages.ACTION_IN_PROGRESS)
+                elif ok:
+                    st.success(Messages.DEVICE_SETTING_SAVED)
+                else:
+                    st.error(Messages.with_code(Messages.DEVICE_SETTING_SAVE_FAILED, err))
+            else:
+                st.warning(Messages.DEVICE_SETTING_REQUIRED)
 
-            if banknote_settings_response.get("isSuccess", False):
-                banknote_settings = banknote_settings_response.get("data", [])
+        # ユーザー設定
+        st.markdown("""---""")
+        st.write("ユーザー設定")
+
+        setting_name = st.selectbox(
+            "設定名", 
+            [
+                "hasCoinPocketSensor", 
+                "refillBanknoteByDepositMode", 
+                "disablePrintReceiptForTransaction"
+            ],
+            key="setting_name"
+        )
 
-                if banknote_settings:
-                    # 現在の紙幣設定をテーブルとして表示
-                    edited_banknote_settings = []
+        setting_value = st.radio(
+            "値", 
+            [("有効", 1), ("無効", 0)],
+            format_func=lambda x: x[0],
+            key="setting_value"
+        )[1]
+
+        st.write(setting_name + "の説明:")
+        if setting_name == "hasCoinPocketSensor":
+            st.write("硬貨モジュールが存在する場合、この機能を有効にすると硬貨モジュールをサポートします。")
+        elif setting_name == "refillBanknoteByDepositMode":
+            st.write("有効にすると、補充モードでドラムに入ることができない紙幣はカセットに転送されます。無効にすると、リジェクトポケットに転送されます。")
+        elif setting_name == "disablePrintReceiptForTransaction":
+            st.write("トランザクション中にレシート印刷機能を無効にします。")
+
+        response = UI.guarded_action("設定を保存", "save_user_setting", lambda: api.setup_setting(setting_name, setting_value))
+        if response is not None:
+            ok, data, err = unwrap(response)
+            if ok:
+                st.success(Messages.USER_SETTING_SAVED)
+            else:
+                st.error(Messages.with_code(Messages.USER_SETTING_SAVE_FAILED, err))
 
-                    for i, setting in enumerate(banknote_settings):
-                        col1, col2 = st.columns([1, 1])
+        # ホッパークリア
+        st.markdown("""---""")
+        st.write("ホッパークリア")
+
+        hopper_id = st.selectbox(
+            "ホッパーID", 
+            [("すべてのホッパー", -1), ("ホッパー1", 1), ("ホッパー2", 2), ("ホッパー3", 3), ("ホッパー4", 4), ("ホッパー5", 5), ("ホッパー6", 6)],
+            format_func=lambda x: x[0],
+            key="hopper_id"
+        )[1]
+
+        response = UI.guarded_action("ホッパークリア実行", "clear_hopper", lambda: api.clear_hopper(hopper_id))
+        if response is not None:
+            ok, data, err = unwrap(response)
+            if ok:
+                st.success(Messages.HOPPER_CLEAR_DONE)
+            else:
+                st.error(Messages.with_code(Messages.HOPPER_CLEAR_FAILED, err))
 
-                        with col1:
-                            denomination = st.number_input(
-                                f"金種 {i+1}", 
-                                value=int(setting.get("denomination", 0)),
-                                key=f"banknote_deno_{i}"
-                            )
+    @staticmethod
+    def banknote_settings_payload(df) -> List[Dict[str, int]]:
+        """紙幣設定の表を送信用の設定リストに変換"""
+        return [
+            {"denomination": int(row["denomination"]), "maxPcs": int(row["maxPcs"])}
+            for row in df.fillna(0).to_dict(orient="records")
+        ]
 
-                        with col2:
-                            max_pcs = st.number_input(
-                                f"最大枚数 {i+1}", 
-                                value=int(setting.get("maxPcs", 0)),
-                                key=f"banknote_max_pcs_{i}"
-                            )
+    @staticmethod
+    def coin_settings_payload(df) -> List[Dict[str, Any]]:
+        """硬貨設定の表を送信用の設定リストに変換"""
+        return [
+            {"input": bool(row["input"]), "output": bool(row["output"]), "pcs": int(row["pcs"])}
+            for row in df.fillna({"input": True, "output": True, "pcs": 0}).to_dict(orient="records")
+        ]
 
-                        edited_banknote_settings.append({
-                            "denomination": denomination,
-                            "maxPcs": max_pcs
-                        })
+    @staticmethod
+    @st.fragment
+    def banknote_settings_tab(api: CashPointPayAPI):
+        """紙幣設定タブ（操作時はこの部分だけを再実行する）"""
+        import pandas as pd
+
+        st.subheader("紙幣モジュール設定")
+
+        if st.button("紙幣設定読み込み", key="load_banknote_settings"):
+            cached_banknote_setup.clear()
+
+        banknote_settings_response = cached_banknote_setup(api.base_url)
+
+        if banknote_settings_response.get("isSuccess", False):
+            banknote_settings = banknote_settings_response.get("data", [])
+
+            if banknote_settings:
+                # 現在の紙幣設定をテーブルとして表示し、フォームでまとめて送信する
+                banknote_df = pd.DataFrame(banknote_settings, columns=["denomination", "maxPcs"])
+                with st.form("banknote_form"):
+                    edited_banknote_df = st.data_editor(
+                        banknote_df,
+                        use_container_width=True,
+                        column_config={
+                            "denomination": st.column_config.NumberColumn("金種", step=1),
+                            "maxPcs": st.column_config.NumberColumn("最大枚数", step=1)
+                        },
+                        key="banknote_editor"
+                    )
+                    banknote_submitted = st.form_submit_button("紙幣設定を保存")
 
-                    if st.button("紙幣設定を保存", key="save_banknote_settings"):
-                        response = api.set_banknote_denomination_setup(edited_banknote_settings)
-                        if response.get("isSuccess", False):
-                            st.success("紙幣設定が保存されました。")
+                if banknote_submitted:
+                    edited_banknote_settings = UI.banknote_settings_payload(edited_banknote_df)
+                    # 読み込んだ設定から変わっていなければ送信しない
+                    if edited_banknote_settings == UI.banknote_settings_payload(banknote_df):
+                        st.info(Messages.SETTINGS_UNCHANGED)
+                    else:
+                        response = UI.run_guarded(
+                            "save_banknote_settings",
+                            lambda: api.set_banknote_denomination_setup(edited_banknote_settings)
+                        )
+                        ok, data, err = unwrap(response)
+                        if response is None:
+                            st.info(Messages.ACTION_IN_PROGRESS)
+                        elif ok:
+                            cached_banknote_setup.clear()
+                            st.success(Messages.BANKNOTE_SETTING_SAVED)
                         else:
-                            st.error("紙幣設定の保存に失敗しました。")
-                else:
-                    st.error("紙幣設定データが見つかりませんでした。")
+                            st.error(Messages.with_code(Messages.BANKNOTE_SETTING_SAVE_FAILED, err))
             else:
-                st.error("紙幣設定データの取得に失敗しました。")
-
-        with tab3:
-            st.subheader("硬貨モジュール設定")
-
-            if st.button("硬貨設定読み込み", key="load_coin_settings"):
-                st.session_state.coin_settings = api.get_coin_tube_setup()
-
-            coin_settings_response = st.session_state.get("coin_settings") or api.get_coin_tube_setup()
-
-            if coin_settings_response.get("isSuccess", False):
-                coin_settings = coin_settings_response.get("data", [])
-
-                if coin_settings:
-                    # 現在の硬貨設定をテーブルとして表示
-                    edited_coin_settings = []
-
-                    for i, setting in enumerate(coin_settings):
-                        col1, col2, col3 = st.columns([1, 1, 1])
-
-                        with col1:
-                            input_enabled = st.checkbox(
-                                f"入金有効 {i+1}", 
-                                value=setting.get("input", True),
-                                key=f"coin_input_{i}"
-                            )
-
-                        with col2:
-                            output_enabled = st.checkbox(
-                                f"出金有効 {i+1}", 
-                                value=setting.get("output", True),
-                                key=f"coin_output_{i}"
-                            )
-
-                        with col3:
-                            pcs = st.number_input(
-                                f"枚数 {i+1}", 
-                                value=int(setting.get("pcs", 0)),
-                                key=f"coin_pcs_{i}"
-                            )
-
-                        edited_coin_settings.append({
-                            "input": input_enabled,
-                            "output": output_enabled,
-                            "pcs": pcs
-                        })
-
-                    if st.button("硬貨設定を保存", key="save_coin_settings"):
-                        response = api.set_coin_tube_setup(edited_coin_settings)
-                        if response.get("isSuccess", False):
-                            st.success("硬貨設定が保存されました。")
+                st.error(Messages.BANKNOTE_SETTING_NOT_FOUND)
+        else:
+            st.error(Messages.BANKNOTE_SETTING_FETCH_FAILED)
+
+    @staticmethod
+    @st.fragment
+    def coin_settings_tab(api: CashPointPayAPI):
+        """硬貨設定タブ（操作時はこの部分だけを再実行する）"""
+        import pandas as pd
+
+        st.subheader("硬貨モジュール設定")
+
+        if st.button("硬貨設定読み込み", key="load_coin_settings"):
+            cached_coin_setup.clear()
+
+        coin_settings_response = cached_coin_setup(api.base_url)
+
+        if coin_settings_response.get("isSuccess", False):
+            coin_settings = coin_settings_response.get("data", [])
+
+            if coin_settings:
+                # 現在の硬貨設定をテーブルとして表示し、フォームでまとめて送信する
+                coin_df = pd.DataFrame(coin_settings, columns=["input", "output", "pcs"])
+                with st.form("coin_form"):
+                    edited_coin_df = st.data_editor(
+                        coin_df,
+                        use_container_width=True,
+                        column_config={
+                            "input": st.column_config.CheckboxColumn("入金有効"),
+                            "output": st.column_config.CheckboxColumn("出金有効"),
+                            "pcs": st.column_config.NumberColumn("枚数", step=1)
+                        },
+                        key="coin_editor"
+                    )
+                    coin_submitted = st.form_submit_button("硬貨設定を保存")
+
+                if coin_submitted:
+                    edited_coin_settings = UI.coin_settings_payload(edited_coin_df)
+                    # 読み込んだ設定から変わっていなければ送信しない
+                    if edited_coin_settings == UI.coin_settings_payload(coin_df):
+                        st.info(Messages.SETTINGS_UNCHANGED)
+                    else:
+                        response = UI.run_guarded(
+                            "save_coin_settings",
+                            lambda: api.set_coin_tube_setup(edited_coin_settings)
+                        )
+                        ok, data, err = unwrap(response)
+                        if response is None:
+                            st.info(Messages.ACTION_IN_PROGRESS)
+                        elif ok:
+                            cached_coin_setup.clear()
+                            st.success(Messages.COIN_SETTING_SAVED)
                         else:
-                            st.error("硬貨設定の保存に失敗しました。")
-                else:
-                    st.error("硬貨設定データが見つかりませんでした。")
+                            st.error(Messages.with_code(Messages.COIN_SETTING_SAVE_FAILED, err))
             else:
-                st.error("硬貨設定データの取得に失敗しました。")
-
-        with tab4:
-            st.subheader("ドア制御")
+                st.error(Messages.COIN_SETTING_NOT_FOUND)
+        else:
+            st.error(Messages.COIN_SETTING_FETCH_FAILED)
 
-            # ドア情報の取得
-            machine_info_response = api.get_machine_info()
+    @staticmethod
+    @st.fragment
+    def door_control_tab(api: CashPointPayAPI):
+        """ドア制御タブ（操作時はこの部分だけを再実行する）"""
+        import pandas as pd
 
-            if machine_info_response.get("isSuccess", False):
-                machine_data = machine_info_response.get("data", {})
-                door_status = machine_data.get("doorStatus", [])
+        st.subheader("ドア制御")
 
-                # 現在のドアステータスを表示
-                st.write("現在のドアステータス")
+        # ドア情報の取得
+        machine_info_response = cached_machine_info(api.base_url)
 
-                for door in door_status:
-                    status = door.get("status", "不明")
-                    status_icon = "🟢" if status.lower() == "closed" else "🔴"
-                    st.write(f"{status_icon} {door.get('name', '不明')}: {status}")
+        if machine_info_response.get("isSuccess", False):
+            UI.stale_notice(machine_info_response)
+            machine_data = machine_info_response.get("data", {})
+            door_status = machine_data.get("doorStatus", [])
 
-                # ドア制御設定
-                st.markdown("""---""")
-                st.write("ドア制御設定")
+            # 現在のドアステータスを1つの表として表示
+            st.write("現在のドアステータス")
 
-                # ドア設定を動的に作成
-                door_settings = {}
+            door_rows = []
+            for door in door_status:
+                status = door.get("status", "不明")
+                status_icon = Config.DOOR_STATUS_ICONS.get(status.lower(), "🔴")
+                door_rows.append({"ドア": door.get("name", "不明"), "状態": f"{status_icon} {status}"})
 
-                col1, col2 = st.columns(2)
+            if door_rows:
+                st.dataframe(pd.DataFrame(door_rows), hide_index=True, use_container_width=True)
 
-                with col1:
-                    door_settings["Note Security Door"] = st.selectbox(
-                        "紙幣セキュリティドア",
-                        ["open", "close"],
-                        key="note_security_door"
-                    )
+            # ドア制御設定
+            st.markdown("""---""")
+            st.write("ドア制御設定")
 
-                    door_settings["Note Drum Door"] = st.selectbox(
-                        "紙幣ドラムドア",
-                        ["open", "close"],
-                        key="note_drum_door"
-                    )
+            # ドア設定をドアの一覧から作成（紙幣側のドアは左列、硬貨側のドアは右列）
+            door_settings = {}
 
-                    door_settings["Note Cassette Door"] = st.selectbox(
-                        "紙幣カセットドア",
-                        ["open", "close"],
-                        key="note_cassette_door"
-                    )
+            col1, col2 = st.columns(2)
 
-                with col2:
-                    door_settings["Coin Security Door"] = st.selectbox(
-                        "硬貨セキュリティドア",
-                        ["open", "close"],
-                        key="coin_security_door"
-                    )
+            for door_name, label, key in Config.DOORS:
+                with col1 if door_name.startswith("Note") else col2:
+                    door_settings[door_name] = st.selectbox(label, ["open", "close"], key=key)
 
-                    timeout = st.number_input(
-                        "オープンタイムアウト（秒）",
-                        min_value=1,
-                        max_value=60,
-                        value=10,
-                        key="door_timeout"
-                    )
+            with col2:
+                timeout = st.number_input(
+                    "オープンタイムアウト（秒）",
+                    min_value=1,
+                    max_value=60,
+                    value=10,
+                    key="door_timeout"
+                )
+
+            response = UI.guarded_action("ドア制御を実行", "execute_door_control", lambda: api.door_control(door_settings, timeout))
+            if response is not None:
+                ok, data, err = unwrap(response)
+                if ok:
+                    cached_machine_info.clear()
+                    st.success(Messages.DOOR_CONTROL_DONE)
+                else:
+                    st.error(Messages.with_code(Messages.DOOR_CONTROL_FAILED, err))
+        else:
+            st.error(Messages.MACHINE_INFO_FETCH_FAILED)
 
-                if st.button("ドア制御を実行", key="execute_door_control"):
-                    response = api.door_control(door_settings, timeout)
-                    if response.get("isSuccess", False):
-                        st.success("ドア制御が正常に実行されました。")
-                    else:
-                        st.error("ドア制御の実行に失敗しました。")
-            else:
-                st.error("機器情報の取得に失敗しました。")
+    @staticmethod
+    @st.fragment
+    def sensor_status_tab(api: CashPointPayAPI):
+        """センサー状態タブ（操作時はこの部分だけを再実行する）"""
+        import pandas as pd
 
-        with tab5:
-            st.subheader("センサー状態")
+        st.subheader("センサー状態")
 
-            if st.button("センサー状態更新", key="refresh_sensor_status"):
-                st.session_state.sensor_status = api.get_sensor_status()
+        if st.button("センサー状態更新", key="refresh_sensor_status"):
+            cached_sensor_status.clear()
+            cached_cassette_status.clear()
 
-            sensor_status_response = st.session_state.get("sensor_status") or api.get_sensor_status()
+        # センサー状態とカセット状態は互いに独立しているため並行取得
+        responses = fetch_concurrently({
+            "sensor_status": lambda: cached_sensor_status(api.base_url),
+            "cassette_status": lambda: cached_cassette_status(api.base_url),
+        })
+        sensor_status_response = responses["sensor_status"]
 
-            if sensor_status_response.get("isSuccess", False):
-                sensor_data = sensor_status_response.get("data", {})
-                sensor_status = sensor_data.get("sensorStatus", {})
+        if sensor_status_response.get("isSuccess", False):
+            sensor_data = sensor_status_response.get("data", {})
+            sensor_status = sensor_data.get("sensorStatus", {})
 
-                # 紙幣センサー
-                st.write("紙幣センサー状態")
-                note_sensors = sensor_status.get("noteSensor", [])
+            # 紙幣センサー
+            st.write("紙幣センサー状態")
+            note_sensors = sensor_status.get("noteSensor", [])
 
-                if note_sensors:
-                    # センサーデータを整形して表示
-                    sensor_df = pd.DataFrame(note_sensors)
+            if note_sensors:
+                # センサーデータを整形して表示
+                sensor_df = pd.DataFrame(note_sensors)
 
-                    # ステータス列を解析して「オン/オフ」と「値」に分割
-                    sensor_df["on_off"] = sensor_df["status"].apply(lambda x: x.split("/")[0].strip())
-                    sensor_df["value"] = sensor_df["status"].apply(lambda x: int(x.split("/")[1].strip()))
+                # ステータス列を解析して「オン/オフ」と「値」に分割（行ごとの関数呼び出しをせず列単位で処理）
+                status_parts = sensor_df["status"].str.split("/", expand=True)
+                sensor_df["on_off"] = status_parts[0].str.strip()
+                sensor_df["value"] = status_parts[1].str.strip().astype(int)
 
-                    # テーブル表示
-                    st.dataframe(sensor_df)
+                # テーブル表示
+                st.dataframe(sensor_df, hide_index=True)
 
-                    # ヒートマップ表示
-                    pivot_df = sensor_df.pivot(index="name", values="value", columns=["on_off"])
+                # ヒートマップ表示
+                pivot_df = sensor_df.set_index(["name", "on_off"])["value"].unstack()
 
-                    if not pivot_df.empty:
-                        fig = px.imshow(
-                            pivot_df,
-                            labels=dict(x="状態", y="センサー名", color="値"),
-                            title="センサー値ヒートマップ"
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("紙幣センサーデータが見つかりませんでした。")
+                if not pivot_df.empty:
+                    st.plotly_chart(build_sensor_heatmap(pivot_df), use_container_width=True)
+            else:
+                st.info(Messages.NOTE_SENSOR_NOT_FOUND)
 
-                # カセットステータス
-                st.markdown("""---""")
-                st.write("カセットステータス")
+            # カセットステータス
+            st.markdown("""---""")
+            st.write("カセットステータス")
 
-                cassette_status_response = api.get_cassette_status()
+            cassette_status_response = responses["cassette_status"]
 
-                if cassette_status_response.get("isSuccess", False):
-                    cassette_data = cassette_status_response.get("data", {})
-                    cassette_status = cassette_data.get("cassetteStatus", "不明")
+            if cassette_status_response.get("isSuccess", False):
+                cassette_data = cassette_status_response.get("data", {})
+                cassette_status = cassette_data.get("cassetteStatus", "不明")
 
-                    status_icon = "🟢" if cassette_status.lower() == "true" else "🔴"
-                    st.write(f"{status_icon} カセットステータス: {cassette_status}")
-                else:
-                    st.error("カセットステータスの取得に失敗しました。")
+                status_icon = Config.CASSETTE_STATUS_ICONS.get(cassette_status.lower(), "🔴")
+                st.write(f"{status_icon} カセットステータス: {cassette_status}")
             else:
-                st.error("センサー状態の取得に失敗しました。")
-
-        st.markdown('</div>', unsafe_allow_html=True)
+                st.error(Messages.CASSETTE_STATUS_FETCH_FAILED)
+        else:
+            st.error(Messages.SENSOR_STATUS_FETCH_FAILED)
 
     @staticmethod
     def error_diagnostics_page(api: CashPointPayAPI):
         """エラー診断ページ表示"""
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">エラー診断</div>', unsafe_allow_html=True)
+        with UI.card("エラー診断"):
 
-        col1, col2 = st.columns([1, 2])
+            col1, col2 = st.columns([1, 2])
 
-        with col1:
-            st.write("エラーコード検索")
-
-            error_code = st.text_input("エラーコード (例: 001001)", key="error_code")
-
-            if st.button("エラーメッセージを取得", key="get_error_message"):
-                if error_code:
-                    response = api.get_error_message(error_code)
-                    if response.get("isSuccess", False):
-                        error_message = response.get("data", "エラーメッセージが見つかりませんでした。")
-
-                        st.markdown(f"""
-                        <div class="info-box info-box-error">
-                            <strong>エラーコード:</strong> {error_code}<br>
-                            <strong>メッセージ:</strong> {error_message}
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.error("エラーメッセージの取得に失敗しました。")
-                else:
-                    st.warning("エラーコードを入力してください。")
+            with col1:
+                UI.error_lookup_panel(api)
 
-        with col2:
-            st.write("システムエラーコード一覧")
-
-            # エラーコードテーブル
-            error_codes = {
-                "001xxx": "紙幣モジュールエラー",
-                "002xxx": "硬貨モジュールエラー",
-                "003xxx": "システムエラー"
-            }
-
-            specific_errors = {
-                "001001": "紙幣が入口に長時間放置されています。もう一度入れてください(1)",
-                "001002": "紙幣が検出器に詰まっています。取り除いてください(2)",
-                "001032": "紙幣の排出中にエラーが発生しました(32)",
-                "002001": "硬貨が入口に詰まっています。取り除いてください(1)",
-                "002010": "硬貨チューブが満杯です(10)",
-                "003001": "システム通信エラー(1)",
-                "003010": "データベースエラー(10)"
-            }
-
-            # エラーコード分類の表示
-            st.write("エラーコード分類")
-            error_category_df = pd.DataFrame([
-                {"コード範囲": code, "説明": desc} for code, desc in error_codes.items()
-            ])
-            st.dataframe(error_category_df)
-
-            # 特定のエラーコード例の表示
-            st.write("代表的なエラーコード例")
-            specific_error_df = pd.DataFrame([
-                {"エラーコード": code, "説明": desc} for code, desc in specific_errors.items()
-            ])
-            st.dataframe(specific_error_df)
-
-            # システムステータス取得
-            st.markdown("""---""")
-            st.write("現在のシステムエラーステータス")
+            with col2:
+                UI.error_status_panel(api)
+
+    @staticmethod
+    @st.fragment
+    def error_lookup_panel(api: CashPointPayAPI):
+        """エラーコード検索欄（操作時はこの部分だけを再実行する）"""
+        st.write("エラーコード検索")
+
+        error_code = st.text_input("エラーコード (例: 001001)", key="error_code")
+
+        if st.button("エラーメッセージを取得", key="get_error_message"):
+            if error_code:
+                response = cached_error_message(api.base_url, error_code)
+                if response.get("isSuccess", False):
+                    error_message = response.get("data", "エラーメッセージが見つかりませんでした。")
+
+                    st.html(f"""
+                    <div class="info-box info-box-error">
+                        <strong>エラーコード:</strong> {html.escape(error_code)}<br>
+                        <strong>メッセージ:</strong> {html.escape(str(error_message))}
+                    </div>
+                    """)
+                else:
+                    st.error(Messages.ERROR_MESSAGE_FETCH_FAILED)
+            else:
+                st.warning(Messages.ERROR_CODE_REQUIRED)
 
-            status_response = api.get_status()
+    @staticmethod
+    @st.fragment
+    def error_status_panel(api: CashPointPayAPI):
+        """エラーコード一覧・ステータス欄（操作時はこの部分だけを再実行する）"""
+        st.write("システムエラーコード一覧")
 
-            if status_response.get("isSuccess", False):
-                status_data = status_response.get("data", {})
-                detail = status_data.get("Detail", {})
+        # エラーコード分類の表示
+        st.write("エラーコード分類")
+        st.table(build_error_category_table())
 
-                note_error = detail.get("Note Error Code", 0)
-                coin_error = detail.get("Coin Error Code", 0)
+        # 特定のエラーコード例の表示
+        st.write("代表的なエラーコード例")
+        st.table(build_error_example_table())
 
-                col1, col2 = st.columns(2)
+        # システムステータス取得
+        st.markdown("""---""")
+        st.write("現在のシステムエラーステータス")
 
-                with col1:
-                    note_status = "🟢 正常" if note_error == 0 else f"🔴 エラー ({note_error})"
-                    st.metric("紙幣モジュールエラー", note_status)
+        # キャッシュの保持期間を待たずに最新のステータスを取り直す
+        if st.button("最新のステータスに更新", key="refresh_error_status"):
+            cached_status.clear()
 
-                with col2:
-                    coin_status = "🟢 正常" if coin_error == 0 else f"🔴 エラー ({coin_error})"
-                    st.metric("硬貨モジュールエラー", coin_status)
+        status_response = cached_status(api.base_url)
 
-                # エラーがある場合、詳細を表示
-                if note_error != 0 or coin_error != 0:
-                    st.markdown(f"""
-                    <div class="info-box info-box-warning">
-                        <strong>エラーが検出されました</strong><br>
-                        ステータスをリセットするか、対応するエラーの対処方法に従ってください。
-                    </div>
-                    """, unsafe_allow_html=True)
+        if status_response.get("isSuccess", False):
+            UI.stale_notice(status_response)
+            status_data = status_response.get("data", {})
+            detail = status_data.get("Detail", {})
 
-                    if st.button("ステータスをリセット", key="reset_error_status"):
-                        reset_response = api.reset_status()
-                        if reset_response.get("isSuccess", False):
-                            st.success("システムステータスがリセットされました。")
-                        else:
-                            st.error("システムステータスのリセットに失敗しました。")
-            else:
-                st.error("システムステータスの取得に失敗しました。")
+            note_error = detail.get("Note Error Code", 0)
+            coin_error = detail.get("Coin Error Code", 0)
 
-        st.markdown('</div>', unsafe_allow_html=True)
+            col1, col2 = st.columns(2)
 
-    @staticmethod
-    def transaction_history_page(api: CashPointPayAPI):
-        """トランザクション履歴ページ表示"""
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.markdown('<div class="card-title">トランザクション履歴</div>', unsafe_allow_html=True)
+            # エラーコードはそのまま表示し、正常/エラーは差分表示の色で示す
+            with col1:
+                st.metric(
+                    "紙幣モジュールエラー", note_error,
+                    delta="正常" if note_error == 0 else "エラー",
+                    delta_color="normal" if note_error == 0 else "inverse"
+                )
 
-        # UUIDリストの管理
-        if "transaction_history" not in st.session_state:
-            st.session_state.transaction_history = []
+            with col2:
+                st.metric(
+                    "硬貨モジュールエラー", coin_error,
+                    delta="正常" if coin_error == 0 else "エラー",
+                    delta_color="normal" if coin_error == 0 else "inverse"
+                )
+
+            # エラーがある場合、詳細を表示
+            if note_error != 0 or coin_error != 0:
+                st.html("""
+                <div class="info-box info-box-warning">
+                    <strong>エラーが検出されました</strong><br>
+                    ステータスをリセットするか、対応するエラーの対処方法に従ってください。
+                </div>
+                """)
+
+                reset_response = UI.guarded_action("ステータスをリセット", "reset_error_status", api.reset_status)
+                if reset_response is not None:
+                    ok, data, err = unwrap(reset_response)
+                    if ok:
+                        cached_status.clear()
+                        st.success(Messages.STATUS_RESET_DONE)
+                    else:
+                        st.error(Messages.with_code(Messages.STATUS_RESET_FAILED, err))
+        else:
+            st.error(Messages.STATUS_FETCH_FAILED)
 
-        # 新しいトランザクション追跡
+    @staticmethod
+    @st.fragment
+    def transaction_tracker(api: CashPointPayAPI):
+        """追跡するトランザクションIDの入力欄（入力・照会中はこの部分だけを再実行する）"""
         col1, col2 = st.columns([3, 1])
 
         with col1:
@@ -1629,8 +2271,8 @@ class UI:
         with col2:
             if st.button("追跡", key="add_to_history"):
                 if transaction_uuid:
-                    if transaction_uuid not in [t.get("uuid") for t in st.session_state.transaction_history]:
-                        response = api.query(transaction_uuid)
+                    if transaction_uuid not in st.session_state.transaction_by_uuid:
+                        response = cached_query(api.base_url, transaction_uuid)
                         if response.get("isSuccess", False):
                             transaction_data = response.get("data", {})
                             info = transaction_data.get("info", {})
@@ -1638,7 +2280,7 @@ class UI:
                             # 現在の日時を追加
                             transaction_record = {
                                 "uuid": transaction_uuid,
-                                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                                "timestamp": datetime.now().isoformat(sep=" ", timespec="seconds"),
                                 "status": info.get("status", "不明"),
                                 "amount": info.get("pay_amount", 0),
                                 "change": info.get("change", 0),
@@ -1646,130 +2288,145 @@ class UI:
                             }
 
                             st.session_state.transaction_history.append(transaction_record)
-                            st.success("トランザクションが履歴に追加されました。")
+                            st.session_state.transaction_by_uuid[transaction_uuid] = transaction_record
+                            st.session_state.uuid_order.append(transaction_uuid)
+                            # 履歴一覧はフラグメントの外にあるため、ページ全体を再実行して反映する
+                            st.session_state.pending_toast = (Messages.HISTORY_ADDED, "✅")
+                            st.rerun()
                         else:
-                            st.error("トランザクション情報の取得に失敗しました。")
+                            st.error(Messages.HISTORY_FETCH_FAILED)
                     else:
-                        st.info("このトランザクションはすでに履歴に存在します。")
+                        st.info(Messages.HISTORY_DUPLICATE)
                 else:
-                    st.warning("トランザクションIDを入力してください。")
-
-        # 履歴表示
-        if st.session_state.transaction_history:
-            st.subheader("トランザクション履歴")
-
-            # トランザクション履歴のデータフレーム
-            history_df = pd.DataFrame([
-                {
-                    "タイムスタンプ": record["timestamp"],
-                    "UUID": record["uuid"],
-                    "ステータス": record["status"],
-                    "金額": record["amount"],
-                    "お釣り": record["change"]
-                }
-                for record in st.session_state.transaction_history
-            ])
-
-            st.dataframe(history_df)
-
-            # トランザクション詳細表示
-            st.subheader("トランザクション詳細")
-
-            selected_uuid = st.selectbox(
-                "詳細を表示するトランザクションを選択",
-                [record["uuid"] for record in st.session_state.transaction_history],
-                key="selected_history_uuid"
-            )
+                    st.warning(Messages.HISTORY_ID_REQUIRED)
 
-            selected_record = next(
-                (record for record in st.session_state.transaction_history if record["uuid"] == selected_uuid),
-                None
-            )
+    @staticmethod
+    def transaction_history_page(api: CashPointPayAPI):
+        """トランザクション履歴ページ表示"""
 
-            if selected_record:
-                # トランザクションデータの表示
-                transaction_data = selected_record["data"]
+        with UI.card("トランザクション履歴"):
 
-                # 情報セクション
-                info = transaction_data.get("info", {})
-                st.write("トランザクション情報")
+            # UUIDリストの管理（重複確認・詳細表示用にUUIDから引ける辞書と、選択肢用のUUIDの並びも併せて持つ）
+            st.session_state.setdefault("transaction_history", [])
+            st.session_state.setdefault("transaction_by_uuid", {})
+            st.session_state.setdefault("uuid_order", [])
 
-                col1, col2, col3 = st.columns(3)
+            # 新しいトランザクション追跡
+            UI.transaction_tracker(api)
 
-                with col1:
-                    st.metric("ステータス", info.get("status", "不明"))
+            # 履歴表示
+            if st.session_state.transaction_history:
+                st.subheader("トランザクション履歴")
 
-                with col2:
-                    st.metric("支払い金額", info.get("pay_amount", 0))
+                # トランザクション履歴のデータフレーム（履歴に変化がなければキャッシュを使う）
+                st.dataframe(build_history_table(tuple(
+                    (record["timestamp"], record["uuid"], record["status"], record["amount"], record["change"])
+                    for record in st.session_state.transaction_history
+                )))
 
-                with col3:
-                    st.metric("お釣り", info.get("change", 0))
+                # トランザクション詳細表示
+                st.subheader("トランザクション詳細")
 
-                # 支払い詳細
-                st.write("支払いアイテム")
-                pay_items = transaction_data.get("pay", [])
+                selected_uuid = st.selectbox(
+                    "詳細を表示するトランザクションを選択",
+                    st.session_state.uuid_order,
+                    key="selected_history_uuid"
+                )
 
-                if pay_items:
-                    pay_df = pd.DataFrame(pay_items)
-                    st.dataframe(pay_df)
-                else:
-                    st.info("支払いアイテムデータがありません。")
-
-                # 入出金詳細
-                st.write("取引詳細")
-                detail_items = transaction_data.get("detail", [])
-
-                if detail_items:
-                    detail_df = pd.DataFrame(detail_items)
-                    st.dataframe(detail_df)
-
-                    # 取引詳細の可視化
-                    fig = px.bar(
-                        detail_df,
-                        x="denomination",
-                        y="pcs",
-                        color="status",
-                        title="取引詳細グラフ",
-                        labels={"denomination": "金種", "pcs": "枚数", "status": "状態"}
-                    )
-                    st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.info("取引詳細データがありません。")
+                selected_record = st.session_state.transaction_by_uuid.get(selected_uuid)
 
-                # JSONデータの表示
-                with st.expander("トランザクションJSON全体を表示"):
-                    st.json(transaction_data)
+                if selected_record:
+                    # トランザクションデータの表示
+                    transaction_data = selected_record["data"]
 
-            # 履歴のクリア
-            if st.button("履歴をクリア"):
-                st.session_state.transaction_history = []
-                st.success("トランザクション履歴がクリアされました。")
-        else:
-            st.info("トランザクション履歴がありません。トランザクションIDを追加してください。")
+                    # 情報セクション
+                    info = transaction_data.get("info", {})
+                    st.write("トランザクション情報")
+
+                    col1, col2, col3 = st.columns(3)
+
+                    with col1:
+                        st.metric("ステータス", info.get("status", "不明"))
+
+                    with col2:
+                        st.metric("支払い金額", info.get("pay_amount", 0))
+
+                    with col3:
+                        st.metric("お釣り", info.get("change", 0))
+
+                    # 支払い詳細
+                    st.write("支払いアイテム")
+                    pay_items = transaction_data.get("pay", [])
+
+                    if pay_items:
+                        st.dataframe(build_cash_table(pay_items))
+                    else:
+                        st.info(Messages.HISTORY_PAY_ITEMS_EMPTY)
+
+                    # 入出金詳細
+                    st.write("取引詳細")
+                    detail_items = transaction_data.get("detail", [])
+
+                    if detail_items:
+                        st.dataframe(build_cash_table(detail_items))
+
+                        # 取引詳細の可視化
+                        st.plotly_chart(build_transaction_detail_bar(detail_items), use_container_width=True)
+                    else:
+                        st.info(Messages.HISTORY_DETAIL_EMPTY)
+
+                    # JSONデータの表示（閉じた状態でもブラウザへ送られないよう、表示を選んだときだけ描画する）
+                    if st.checkbox("トランザクションJSON全体を表示", key="show_history_json"):
+                        st.json(transaction_data)
 
-        st.markdown('</div>', unsafe_allow_html=True)
+                # 履歴のクリア
+                if st.button("履歴をクリア", key="clear_history"):
+                    st.session_state.transaction_history = []
+                    st.session_state.transaction_by_uuid = {}
+                    st.session_state.uuid_order = []
+                    st.success(Messages.HISTORY_CLEARED)
+            else:
+                st.info(Messages.HISTORY_EMPTY)
 
     @staticmethod
     def footer():
         """フッター表示"""
-        st.markdown("""
+        st.html("""
         <div class="footer">
             <p>© 2025 Cash Point Pay マネジメントシステム | バージョン 1.0.0</p>
         </div>
-        """, unsafe_allow_html=True)
+        """)
 
 # メインアプリクラス
 class CashPointPayApp:
-    def __init__(self):
-        # セッション状態の初期化
-        if "logged_in" not in st.session_state:
-            st.session_state.logged_in = False
+    # ページ識別子と描画関数の対応
+    PAGES = MappingProxyType({
+        "dashboard": UI.dashboard_page,
+        "payment": UI.payment_page,
+        "cash_management": UI.cash_management_page,
+        "system_settings": UI.system_settings_page,
+        "error_diagnostics": UI.error_diagnostics_page,
+        "transaction_history": UI.transaction_history_page
+    })
+
+    # セッション状態の既定値
+    SESSION_DEFAULTS = MappingProxyType({
+        "logged_in": False,
+        "login_base_url": Config.DEFAULT_API_BASE_URL,
+        "current_transaction_uuid": "",
+        "api_base_url": Config.DEFAULT_API_BASE_URL
+    })
 
-        if "current_transaction_uuid" not in st.session_state:
-            st.session_state.current_transaction_uuid = ""
+    def __init__(self):
+        # 再読み込みで失われた取引IDはURLのクエリパラメータから復元する
+        st.session_state.setdefault(
+            "current_transaction_uuid",
+            st.query_params.get(Config.TRANSACTION_QUERY_PARAM, "")
+        )
 
-        if "api_base_url" not in st.session_state:
-            st.session_state.api_base_url = Config.DEFAULT_API_BASE_URL
+        # セッション状態の初期化（未設定のキーだけ既定値を入れる）
+        for key, value in CashPointPayApp.SESSION_DEFAULTS.items():
+            st.session_state.setdefault(key, value)
 
         # ページ設定
         UI.set_page_config()
@@ -1778,8 +2435,14 @@ class CashPointPayApp:
         """アプリケーションの実行"""
         UI.header()
 
+        # 前回の実行から持ち越した通知を表示
+        pending_toast = st.session_state.pop("pending_toast", None)
+        if pending_toast:
+            message, icon = pending_toast
+            st.toast(message, icon=icon)
+
         # APIインスタンス
-        api = CashPointPayAPI(st.session_state.api_base_url)
+        api = get_api(st.session_state.api_base_url)
 
         if not st.session_state.logged_in:
             # 未ログイン状態
@@ -1788,18 +2451,7 @@ class CashPointPayApp:
             # ログイン済み状態
             selected_page = UI.sidebar_navigation()
 
-            if selected_page == "dashboard":
-                UI.dashboard_page(api)
-            elif selected_page == "payment":
-                UI.payment_page(api)
-            elif selected_page == "cash_management":
-                UI.cash_management_page(api)
-            elif selected_page == "system_settings":
-                UI.system_settings_page(api)
-            elif selected_page == "error_diagnostics":
-                UI.error_diagnostics_page(api)
-            elif selected_page == "transaction_history":
-                UI.transaction_history_page(api)
+            CashPointPayApp.PAGES.get(selected_page, UI.dashboard_page)(api)
 
         UI.footer()
 